@@ -3,21 +3,53 @@ LangGraph workflow for converting raw scraped listing data into canonical struct
 This implements a single deterministic agent that extracts canonical data without scoring or evaluation.
 """
 
+from __future__ import annotations
+
 from typing import TypedDict, Optional, Dict, Any, List
 from uuid import uuid4
+from functools import lru_cache
+from operator import attrgetter
+import asyncio
 import hashlib
 import json
-from datetime import datetime
-
+import logging
+import os
+from datetime import datetime, timedelta
+
+import msgspec
+import orjson
+from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from langgraph.cache.memory import InMemoryCache
 from langgraph.graph import StateGraph, START, END
+from langgraph.types import CachePolicy
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
 from pydantic import BaseModel, Field, ValidationError
 
+from schemas_canonical import CanonicalRecord
 from database import get_session_sync
 from models import CanonicalBusinessRecord
 from utils import log_agent_execution
 
+# Module logger; %-style args are only formatted when the level is enabled,
+# unlike the unconditional f-string prints this replaces. Named log because
+# the node bodies bind the audit AgentLogger as logger.
+log = logging.getLogger(__name__)
+
+
+# Cache/versioning constants - bumping a stage's prompt version invalidates
+# its cached LLM responses
+MODEL_ID = "gpt-5-mini"
+# Backend family for the configured model; Anthropic-style backends need
+# explicit cache_control checkpoints to get prompt caching on the invariant
+# system block (OpenAI prefix caching is automatic)
+LLM_PROVIDER = os.getenv("LLM_PROVIDER", "openai")
+EXTRACTION_PROMPT_VERSION = "v1"
+SCORING_PROMPT_VERSION = "v1"
+FOLLOWUP_PROMPT_VERSION = "v1"
+LLM_CACHE_TTL = timedelta(days=7)
+
 
 # =============================================================================
 # GRAPH STATE DEFINITION
@@ -27,8 +59,11 @@ class CategorizationState(TypedDict):
     """LangGraph state for the categorization workflow"""
     business_id: str
     raw_listing_id: str
-    raw_text: str
-    raw_html: str
+    # Blobs may be None when the caller passes only raw_listing_id;
+    # categorize_listing then loads them from the DB on demand, keeping
+    # multi-MB HTML out of the state that LangGraph threads between nodes
+    raw_text: Optional[str]
+    raw_html: Optional[str]
     listing_metadata: Dict[str, Any]
     agent_run_id: str
     canonical_record: Optional[Dict[str, Any]]
@@ -40,168 +75,163 @@ class CategorizationState(TypedDict):
 
 
 # =============================================================================
-# CANONICAL SCHEMA DEFINITION
+# CANONICAL SCHEMA HELPERS
+# (schema classes live in schemas_canonical; scoring and follow-up schemas are
+# imported lazily from schemas_scoring / schemas_followup to keep cold-start
+# import cost down for extraction-only workers)
 # =============================================================================
 
-class FinancialsDomain(BaseModel):
-    """Financial metrics and valuation data"""
-    asking_price_usd: Optional[float] = Field(None, description="Asking price in USD")
-    monthly_revenue_usd: Optional[float] = Field(None, description="Monthly recurring revenue in USD")
-    annual_revenue_usd: Optional[float] = Field(None, description="Annual revenue in USD")
-    monthly_profit_usd: Optional[float] = Field(None, description="Monthly profit in USD")
-    annual_profit_usd: Optional[float] = Field(None, description="Annual profit in USD")
-    profit_margin_percent: Optional[float] = Field(None, description="Profit margin as percentage")
-    revenue_growth_rate_percent: Optional[float] = Field(None, description="Year-over-year revenue growth rate")
-
-
-class ProductDomain(BaseModel):
-    """Product and business model details"""
-    business_type: Optional[str] = Field(None, description="Type of business (SaaS, e-commerce, etc.)")
-    vertical: Optional[str] = Field(None, description="Industry vertical")
-    product_category: Optional[str] = Field(None, description="Specific product category")
-    features: Optional[list[str]] = Field(None, description="Key product features")
-    target_market: Optional[str] = Field(None, description="Target customer segment")
-    business_model: Optional[str] = Field(None, description="Revenue model (subscription, transaction, etc.)")
-
-
-class CustomersDomain(BaseModel):
-    """Customer metrics and segmentation"""
-    total_customers: Optional[int] = Field(None, description="Total number of customers")
-    monthly_active_users: Optional[int] = Field(None, description="Monthly active users")
-    paying_customers: Optional[int] = Field(None, description="Number of paying customers")
-    churn_rate_percent: Optional[float] = Field(None, description="Monthly churn rate as percentage")
-    customer_concentration_risk: Optional[str] = Field(None, description="Assessment of customer concentration risk")
-    customer_segments: Optional[list[str]] = Field(None, description="Customer segments served")
-
-
-class OperationsDomain(BaseModel):
-    """Operational details and requirements"""
-    owner_hours_per_week: Optional[int] = Field(None, description="Hours per week owner spends on business")
-    full_time_employees: Optional[int] = Field(None, description="Number of full-time employees")
-    part_time_employees: Optional[int] = Field(None, description="Number of part-time employees")
-    key_dependencies: Optional[list[str]] = Field(None, description="Critical operational dependencies")
-    key_person_risk: Optional[str] = Field(None, description="Assessment of key person dependency risk")
-    scalability_factors: Optional[list[str]] = Field(None, description="Factors limiting or enabling scalability")
-
-
-class TechnologyDomain(BaseModel):
-    """Technology stack and infrastructure"""
-    tech_stack: Optional[list[str]] = Field(None, description="Primary technologies used")
-    hosting_provider: Optional[str] = Field(None, description="Hosting/cloud provider")
-    code_ownership: Optional[str] = Field(None, description="Code ownership status (owned, leased, etc.)")
-    api_dependencies: Optional[list[str]] = Field(None, description="External API dependencies")
-    data_storage: Optional[str] = Field(None, description="Primary data storage solution")
-    development_status: Optional[str] = Field(None, description="Development/documentation status")
-
-
-class GrowthDomain(BaseModel):
-    """Growth metrics and strategies"""
-    growth_channels: Optional[list[str]] = Field(None, description="Primary customer acquisition channels")
-    monthly_growth_rate_percent: Optional[float] = Field(None, description="Monthly growth rate")
-    marketing_spend_percent: Optional[float] = Field(None, description="Marketing spend as percentage of revenue")
-    customer_acquisition_cost: Optional[float] = Field(None, description="Customer acquisition cost")
-    lifetime_value: Optional[float] = Field(None, description="Customer lifetime value")
-    growth_trends: Optional[str] = Field(None, description="Growth trend assessment")
-
-
-class RisksDomain(BaseModel):
-    """Risk assessment and mitigation factors"""
-    platform_dependency_risk: Optional[str] = Field(None, description="Dependency on specific platforms")
-    regulatory_risk: Optional[str] = Field(None, description="Regulatory or compliance risks")
-    ip_risk: Optional[str] = Field(None, description="Intellectual property risks")
-    competitive_risk: Optional[str] = Field(None, description="Competitive landscape risks")
-    technical_debt: Optional[str] = Field(None, description="Technical debt assessment")
-    market_risk: Optional[str] = Field(None, description="Market-related risks")
-
-
-class SellerDomain(BaseModel):
-    """Seller details and motivations"""
-    location: Optional[str] = Field(None, description="Seller's location/country")
-    selling_reason: Optional[str] = Field(None, description="Primary reason for selling")
-    post_sale_involvement: Optional[str] = Field(None, description="Willingness to assist post-sale")
-    transition_period: Optional[str] = Field(None, description="Available transition support period")
-    seller_experience: Optional[str] = Field(None, description="Seller's experience level")
-    business_age_years: Optional[float] = Field(None, description="Age of business in years")
-
-
-class ConfidenceFlagsDomain(BaseModel):
-    """Uncertainty indicators and data quality flags"""
-    missing_financial_data: Optional[bool] = Field(None, description="Critical financial data is missing")
-    assumed_values: Optional[list[str]] = Field(None, description="Fields where assumptions were made")
-    contradictory_information: Optional[list[str]] = Field(None, description="Areas with contradictory data")
-    requires_followup: Optional[list[str]] = Field(None, description="Topics requiring seller clarification")
-    data_quality_score: Optional[int] = Field(None, description="Overall data quality score (1-10)")
-    confidence_level: Optional[str] = Field(None, description="Overall confidence in extracted data")
-
-
-class CanonicalRecord(BaseModel):
-    """Complete canonical business record schema"""
-    financials: Optional[FinancialsDomain] = Field(None)
-    product: Optional[ProductDomain] = Field(None)
-    customers: Optional[CustomersDomain] = Field(None)
-    operations: Optional[OperationsDomain] = Field(None)
-    technology: Optional[TechnologyDomain] = Field(None)
-    growth: Optional[GrowthDomain] = Field(None)
-    risks: Optional[RisksDomain] = Field(None)
-    seller: Optional[SellerDomain] = Field(None)
-    confidence_flags: Optional[ConfidenceFlagsDomain] = Field(None)
+from schemas_canonical import CanonicalRecord
+def load_confidence_flags(data: Dict[str, Any]) -> "ConfidenceFlagsFast":
+    """Build the slotted in-process confidence-flags struct from trusted JSON.
 
+    Unknown keys from older records are ignored; consumers only do attribute
+    reads, so the lightweight struct replaces the pydantic model on this hop.
+    """
+    from schemas_fast import ConfidenceFlagsFast
 
-# =============================================================================
-# SCORING SCHEMA DEFINITION
-# =============================================================================
+    return msgspec.convert(data, type=ConfidenceFlagsFast, strict=False)
 
-class ScoringComponents(BaseModel):
-    """Component scores from LLM analysis (0-100 scale)"""
-    price_efficiency_score: float = Field(..., ge=0, le=100, description="Price relative to revenue/profit quality")
-    revenue_quality_score: float = Field(..., ge=0, le=100, description="Revenue stability and growth quality")
-    moat_score: float = Field(..., ge=0, le=100, description="Competitive moat and defensibility")
-    ai_leverage_score: float = Field(..., ge=0, le=100, description="AI/ML automation potential")
-    operations_score: float = Field(..., ge=0, le=100, description="Operational efficiency and scalability")
-    risk_score: float = Field(..., ge=0, le=100, description="Overall risk assessment")
-    trust_score: float = Field(..., ge=0, le=100, description="Trust in reported data quality")
 
+def parse_scoring_output(raw_result: Dict[str, Any]) -> ScoringOutput:
+    """Validate raw LLM scoring output via msgspec and rebuild the pydantic model.
 
-class ScoringOutput(BaseModel):
-    """Complete scoring output from LLM"""
-    component_scores: ScoringComponents
-    top_buy_reasons: List[str] = Field(..., min_items=1, max_items=5, description="Top reasons to pursue acquisition")
-    top_risks: List[str] = Field(..., min_items=1, max_items=5, description="Top risks identified")
+    msgspec enforces the same range/length constraints as ScoringOutput but
+    several times faster; model_construct then skips the redundant second
+    validation pass.
+    """
+    from schemas_fast import ScoringOutputFast
+    from schemas_scoring import ScoringComponents, ScoringOutput
+
+    fast = msgspec.convert(raw_result, type=ScoringOutputFast)
+    return ScoringOutput.model_construct(
+        component_scores=ScoringComponents.model_construct(
+            **msgspec.structs.asdict(fast.component_scores)
+        ),
+        top_buy_reasons=list(fast.top_buy_reasons),
+        top_risks=list(fast.top_risks),
+    )
+
+
+def parse_followup_output(raw_result: Dict[str, Any]) -> FollowUpQuestionsOutput:
+    """Validate raw LLM follow-up output via msgspec and rebuild the pydantic model."""
+    from schemas_fast import FollowUpQuestionsOutputFast
+    from schemas_followup import FollowUpQuestion, FollowUpQuestionsOutput
+
+    fast = msgspec.convert(raw_result, type=FollowUpQuestionsOutputFast)
+    return FollowUpQuestionsOutput.model_construct(
+        questions=[
+            FollowUpQuestion.model_construct(**msgspec.structs.asdict(question))
+            for question in fast.questions
+        ]
+    )
 
 
 # =============================================================================
-# FOLLOW-UP QUESTION SCHEMA DEFINITION
+# VERSIONING AND DATABASE LOGIC
 # =============================================================================
 
-class FollowUpQuestion(BaseModel):
-    """Individual follow-up question with metadata"""
-    question_text: str = Field(..., min_length=10, max_length=500, description="Generated question for seller")
-    triggered_by_field: str = Field(..., min_length=1, max_length=100, description="Field/uncertainty that triggered this question")
-    severity: str = Field(..., pattern="^(critical|high|medium|low)$", description="Question priority level")
+def _json_dumps(obj: Any) -> str:
+    """orjson-backed dumps for hot-path prompt payloads (3-5x stdlib json)"""
+    return orjson.dumps(obj).decode()
 
 
-class FollowUpQuestionsOutput(BaseModel):
-    """Complete follow-up questions output from LLM"""
-    questions: List[FollowUpQuestion] = Field(..., max_items=8, description="Generated follow-up questions")
+@lru_cache(maxsize=None)
+def _schema_json(model_cls) -> str:
+    """Dumped JSON schema for a pydantic model class, built once per class.
 
+    model_json_schema() walks the full model tree on every call, which is far
+    too expensive to repeat per listing; the result is invariant for the
+    process lifetime.
+    """
+    return _json_dumps(model_cls.model_json_schema())
+
+
+def _compact(value: Any) -> Any:
+    """Recursively drop None/empty members from dicts and lists.
+
+    Null-only keys spend prompt tokens without carrying information;
+    pruning them shrinks the dynamic prompt suffix (and with it the
+    variable part that defeats provider prefix caching).
+    """
+    if isinstance(value, dict):
+        compacted = ((k, _compact(v)) for k, v in value.items())
+        return {k: v for k, v in compacted if v not in (None, {}, [], "")}
+    if isinstance(value, list):
+        return [v for v in (_compact(item) for item in value) if v not in (None, {}, [], "")]
+    return value
+
+
+@lru_cache(maxsize=1)
+def _canonical_columns_select():
+    """Core SELECT of just the columns the scoring/follow-up prompts read.
+
+    Returns plain Row tuples (attribute access still works) and skips ORM
+    entity hydration, identity-map and expiry bookkeeping entirely.
+    """
+    return select(
+        CanonicalBusinessRecord.id,
+        CanonicalBusinessRecord.content_hash,
+        CanonicalBusinessRecord.financials,
+        CanonicalBusinessRecord.product,
+        CanonicalBusinessRecord.customers,
+        CanonicalBusinessRecord.operations,
+        CanonicalBusinessRecord.technology,
+        CanonicalBusinessRecord.growth,
+        CanonicalBusinessRecord.risks,
+        CanonicalBusinessRecord.seller,
+        CanonicalBusinessRecord.confidence_flags,
+    )
 
-# =============================================================================
-# VERSIONING AND DATABASE LOGIC
-# =============================================================================
 
 def calculate_content_hash(raw_text: str, raw_html: str, listing_metadata: Dict[str, Any]) -> str:
-    """Calculate SHA-256 hash of raw content for versioning"""
-    content = {
-        "raw_text": raw_text,
-        "raw_html": raw_html,
-        "listing_metadata": listing_metadata
-    }
-    content_str = json.dumps(content, sort_keys=True)
-    return hashlib.sha256(content_str.encode()).hexdigest()
+    """Calculate BLAKE2b hash of raw content for versioning.
+
+    Each part is framed with an 8-byte length prefix so field boundaries
+    can't collide, avoiding the intermediate JSON dump of the large
+    raw_text/raw_html blobs entirely.
+    """
+    h = hashlib.blake2b(digest_size=32)
+    for part in (
+        raw_text.encode(),
+        raw_html.encode(),
+        orjson.dumps(listing_metadata, option=orjson.OPT_SORT_KEYS),
+    ):
+        h.update(len(part).to_bytes(8, "big"))
+        h.update(part)
+    return h.hexdigest()
+
+
+class _LatestVersionCache:
+    """In-process cache of the latest (version, content_hash) per business_id.
+
+    Writes through insert_canonical_record keep it fresh, so bursts of
+    re-processing the same listing skip the latest-version SELECT entirely.
+    Bounded with FIFO eviction; no TTL needed since every write updates it.
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        self._maxsize = maxsize
+        self._entries: Dict[str, tuple[int, str]] = {}
+
+    def get(self, business_id: str) -> Optional[tuple[int, str]]:
+        return self._entries.get(business_id)
+
+    def put(self, business_id: str, version: int, content_hash: str) -> None:
+        if len(self._entries) >= self._maxsize and business_id not in self._entries:
+            self._entries.pop(next(iter(self._entries)))
+        self._entries[business_id] = (version, content_hash)
+
+
+_latest_version_cache = _LatestVersionCache()
 
 
 def get_latest_version(business_id: str, session) -> tuple[int, str]:
     """Get the latest version and content hash for a business_id"""
+    cached = _latest_version_cache.get(business_id)
+    if cached is not None:
+        return cached
+
     result = session.query(
         CanonicalBusinessRecord.version,
         CanonicalBusinessRecord.content_hash
@@ -212,6 +242,7 @@ def get_latest_version(business_id: str, session) -> tuple[int, str]:
     ).first()
 
     if result:
+        _latest_version_cache.put(business_id, result.version, result.content_hash)
         return result.version, result.content_hash
     return 0, ""
 
@@ -232,64 +263,179 @@ def insert_canonical_record(
     agent_run_id: str,
     canonical_data: CanonicalRecord,
     content_hash: str,
-    session
-) -> str:
-    """Insert a new canonical business record with proper versioning"""
-    should_create, version = should_create_new_version(business_id, content_hash, session)
-
-    if not should_create:
-        # Return existing record ID if no changes
-        existing = session.query(CanonicalBusinessRecord).filter(
-            CanonicalBusinessRecord.business_id == business_id,
-            CanonicalBusinessRecord.version == version
-        ).first()
-        return existing.id if existing else ""
+    session,
+    commit: bool = True
+) -> tuple[str, int]:
+    """Insert a new canonical business record with proper versioning.
+
+    A single INSERT ... ON CONFLICT DO NOTHING RETURNING id against the
+    (business_id, content_hash) unique index replaces the SELECT-then-INSERT
+    round-trips; the next version number is computed DB-side in the same
+    statement. Returns (record_id, version) so callers never need a
+    read-back query for the version they just wrote.
+
+    With commit=False the row is only executed on the caller's open
+    transaction (and the version cache left untouched until it commits),
+    letting batch callers group many inserts under one commit.
+    """
+    # Single model_dump walks the schema once instead of nine per-domain .dict()
+    # calls; absent domains default to None so NULL semantics are unchanged.
+    dumped = canonical_data.model_dump(mode="json", exclude_none=False)
+
+    # Denormalized hot scalars, written alongside the authoritative JSONB so
+    # screening filters compare typed columns instead of per-row casts
+    financials = dumped.get("financials") or {}
+    product = dumped.get("product") or {}
+    customers = dumped.get("customers") or {}
+
+    version_expr = (
+        select(func.coalesce(func.max(CanonicalBusinessRecord.version), 0) + 1)
+        .where(CanonicalBusinessRecord.business_id == business_id)
+        .scalar_subquery()
+    )
 
-    # Create new canonical record
-    record = CanonicalBusinessRecord(
+    stmt = pg_insert(CanonicalBusinessRecord).values(
+        id=str(uuid4()),
         business_id=business_id,
-        version=version,
+        version=version_expr,
         agent_run_id=agent_run_id,
         content_hash=content_hash,
-        financials=canonical_data.financials.dict() if canonical_data.financials else None,
-        product=canonical_data.product.dict() if canonical_data.product else None,
-        customers=canonical_data.customers.dict() if canonical_data.customers else None,
-        operations=canonical_data.operations.dict() if canonical_data.operations else None,
-        technology=canonical_data.technology.dict() if canonical_data.technology else None,
-        growth=canonical_data.growth.dict() if canonical_data.growth else None,
-        risks=canonical_data.risks.dict() if canonical_data.risks else None,
-        seller=canonical_data.seller.dict() if canonical_data.seller else None,
-        confidence_flags=canonical_data.confidence_flags.dict() if canonical_data.confidence_flags else None,
-    )
+        financials=dumped.get("financials"),
+        product=dumped.get("product"),
+        customers=dumped.get("customers"),
+        operations=dumped.get("operations"),
+        technology=dumped.get("technology"),
+        growth=dumped.get("growth"),
+        risks=dumped.get("risks"),
+        seller=dumped.get("seller"),
+        confidence_flags=dumped.get("confidence_flags"),
+        asking_price_usd=financials.get("asking_price_usd"),
+        monthly_revenue_usd=financials.get("monthly_revenue_usd"),
+        monthly_profit_usd=financials.get("monthly_profit_usd"),
+        business_vertical=product.get("vertical"),
+        customer_count=customers.get("total_customers"),
+        created_at=datetime.utcnow(),
+    ).on_conflict_do_nothing(
+        index_elements=['business_id', 'content_hash']
+    ).returning(CanonicalBusinessRecord.id, CanonicalBusinessRecord.version)
+
+    inserted = session.execute(stmt).first()
+    if commit:
+        session.commit()
 
-    session.add(record)
+    if inserted:
+        if commit:
+            _latest_version_cache.put(business_id, inserted.version, content_hash)
+        return inserted.id, inserted.version
+
+    # Content unchanged - return the record already stored for this hash
+    # (the only case where the upsert returns no row)
+    existing = session.query(
+        CanonicalBusinessRecord.id, CanonicalBusinessRecord.version
+    ).filter(
+        CanonicalBusinessRecord.business_id == business_id,
+        CanonicalBusinessRecord.content_hash == content_hash
+    ).first()
+    return (existing.id, existing.version) if existing else ("", 0)
+
+
+# =============================================================================
+# LLM RESPONSE CACHE
+# =============================================================================
+
+def llm_cache_key(stage: str, prompt_version: str, content_hash: str) -> str:
+    """Content-addressable cache key for one LLM stage invocation"""
+    return hashlib.blake2b(
+        f"{stage}|{prompt_version}|{MODEL_ID}|{content_hash}".encode(),
+        digest_size=32,
+    ).hexdigest()
+
+
+def get_cached_llm_response(
+    stage: str,
+    prompt_version: str,
+    content_hash: str,
+    session
+) -> Optional[Dict[str, Any]]:
+    """Look up a cached LLM response; expired entries are deleted lazily"""
+    from models import LLMCache
+
+    key = llm_cache_key(stage, prompt_version, content_hash)
+    entry = session.query(LLMCache).filter(LLMCache.cache_key == key).first()
+
+    if not entry:
+        return None
+
+    if entry.expires_at and entry.expires_at < datetime.utcnow():
+        session.delete(entry)
+        session.commit()
+        return None
+
+    return entry.response
+
+
+def store_llm_response(
+    stage: str,
+    prompt_version: str,
+    content_hash: str,
+    response: Dict[str, Any],
+    session
+) -> None:
+    """Store a parsed LLM response in the cache with a TTL"""
+    from models import LLMCache
+
+    entry = LLMCache(
+        cache_key=llm_cache_key(stage, prompt_version, content_hash),
+        stage=stage,
+        prompt_version=prompt_version,
+        model_name=MODEL_ID,
+        content_hash=content_hash,
+        response=response,
+        expires_at=datetime.utcnow() + LLM_CACHE_TTL,
+    )
+    session.merge(entry)
     session.commit()
-    session.refresh(record)
 
-    return record.id
+
+def evict_llm_cache_entry(
+    stage: str,
+    prompt_version: str,
+    content_hash: str,
+    session
+) -> None:
+    """Remove a cache entry that failed schema revalidation"""
+    from models import LLMCache
+
+    key = llm_cache_key(stage, prompt_version, content_hash)
+    session.query(LLMCache).filter(LLMCache.cache_key == key).delete()
+    session.commit()
 
 
 # =============================================================================
 # SCORING LOGIC
 # =============================================================================
 
-def calculate_total_score(component_scores: ScoringComponents) -> float:
-    """Calculate deterministic total score using weighted averages"""
-    weights = {
-        'price_efficiency_score': 0.20,
-        'revenue_quality_score': 0.15,
-        'moat_score': 0.20,
-        'ai_leverage_score': 0.15,
-        'operations_score': 0.10,
-        'risk_score': 0.10,
-        'trust_score': 0.10
-    }
+# Component weights for the deterministic total score, fixed at module scope
+# so each call avoids rebuilding the mapping; the C-implemented attrgetter
+# pulls all seven scores in one pass.
+_SCORE_WEIGHTS = (
+    ('price_efficiency_score', 0.20),
+    ('revenue_quality_score', 0.15),
+    ('moat_score', 0.20),
+    ('ai_leverage_score', 0.15),
+    ('operations_score', 0.10),
+    ('risk_score', 0.10),
+    ('trust_score', 0.10),
+)
+_SCORE_GETTER = attrgetter(*(name for name, _ in _SCORE_WEIGHTS))
 
-    total = 0.0
-    for field_name, weight in weights.items():
-        score_value = getattr(component_scores, field_name)
-        total += score_value * weight
 
+def calculate_total_score(component_scores: ScoringComponents) -> float:
+    """Calculate deterministic total score using weighted averages"""
+    total = sum(
+        score * weight
+        for score, (_, weight) in zip(_SCORE_GETTER(component_scores), _SCORE_WEIGHTS)
+    )
     return round(total, 2)
 
 
@@ -305,60 +451,47 @@ def determine_tier(total_score: float) -> str:
         return 'D'
 
 
+# Per-flag penalty vectors over _PENALTY_FIELDS, precomputed at module scope
+# so applying penalties is a single fused pass instead of per-field dict churn
+_PENALTY_FIELDS = tuple(name for name, _ in _SCORE_WEIGHTS)
+_FLAG_PENALTIES = {
+    #                             price  rev  moat   ai   ops  risk trust
+    'missing_financial_data':    (-20, -15,    0,    0,    0,    0,  -25),
+    'assumed_values':            (  0,    0,   0,    0,    0,    0,  -10),
+    'requires_followup':         (  0,    0,   0,    0,    0,    0,  -15),
+    'contradictory_information': (  0,    0,   0,    0,    0,    0,  -10),
+}
+
+
 def apply_data_quality_penalties(
     component_scores: ScoringComponents,
-    confidence_flags: Optional[ConfidenceFlagsDomain]
+    confidence_flags: Optional[ConfidenceFlagsFast]
 ) -> ScoringComponents:
     """Apply penalties for missing or ambiguous data"""
-    penalties = {
-        'price_efficiency_score': 0,
-        'revenue_quality_score': 0,
-        'moat_score': 0,
-        'ai_leverage_score': 0,
-        'operations_score': 0,
-        'risk_score': 0,
-        'trust_score': 0
-    }
+    from schemas_scoring import ScoringComponents
 
-    # Apply penalties based on confidence flags
+    totals = [0] * len(_PENALTY_FIELDS)
     if confidence_flags:
-        if confidence_flags.missing_financial_data:
-            penalties['price_efficiency_score'] = max(0, penalties['price_efficiency_score'] - 20)
-            penalties['revenue_quality_score'] = max(0, penalties['revenue_quality_score'] - 15)
-            penalties['trust_score'] = max(0, penalties['trust_score'] - 25)
-
-        if confidence_flags.assumed_values:
-            penalties['trust_score'] = max(0, penalties['trust_score'] - 10)
-
-        if confidence_flags.requires_followup:
-            penalties['trust_score'] = max(0, penalties['trust_score'] - 15)
-
-        if confidence_flags.contradictory_information:
-            penalties['trust_score'] = max(0, penalties['trust_score'] - 10)
-
-    # Apply penalties to component scores
-    updated_scores = {}
-    for field_name in penalties:
-        original_score = getattr(component_scores, field_name)
-        penalty = penalties[field_name]
-        updated_scores[field_name] = max(0, original_score + penalty)
-
-    return ScoringComponents(**updated_scores)
+        for flag, row in _FLAG_PENALTIES.items():
+            if getattr(confidence_flags, flag):
+                totals = [total + penalty for total, penalty in zip(totals, row)]
+
+    # Clamp penalized scores back into the 0-100 range in one pass
+    return ScoringComponents.model_construct(**{
+        field: min(100.0, max(0.0, score + penalty))
+        for field, score, penalty in zip(
+            _PENALTY_FIELDS, _SCORE_GETTER(component_scores), totals
+        )
+    })
 
 
 def validate_scoring_output(scoring_output: ScoringOutput) -> bool:
-    """Validate scoring output meets requirements"""
-    # Ensure all component scores are present and in valid range
-    for field_name in ScoringComponents.__fields__:
-        score = getattr(scoring_output.component_scores, field_name)
-        if not isinstance(score, (int, float)) or not (0 <= score <= 100):
-            return False
-
-    # Ensure we have buy reasons and risks
-    if not scoring_output.top_buy_reasons or not scoring_output.top_risks:
-        return False
+    """Validate scoring output meets requirements
 
-    return True
+    Score presence and 0-100 bounds are already enforced when the raw LLM
+    result is parsed, so only the list requirements are re-checked here.
+    """
+    return bool(scoring_output.top_buy_reasons) and bool(scoring_output.top_risks)
 
 
 def insert_scoring_record(
@@ -398,10 +531,12 @@ def insert_scoring_record(
     )
 
     session.add(record)
+    # id is generated client-side by the model default; capture it before
+    # commit so the expired instance doesn't trigger a refresh SELECT
+    record_id = record.id
     session.commit()
-    session.refresh(record)
 
-    return record.id
+    return record_id
 
 
 # =============================================================================
@@ -420,22 +555,29 @@ def should_generate_follow_up_questions(scoring_output: Dict[str, Any]) -> bool:
     return tier in ('A', 'B') and total_score is not None and total_score >= 70
 
 
+# Hoisted to module scope so uncertainty analysis doesn't rebuild these
+# per call
+_CANONICAL_DOMAINS = ('financials', 'product', 'customers', 'operations', 'technology', 'growth', 'risks', 'seller')
+_HIGH_SEVERITY_DOMAINS = frozenset(('financials', 'customers', 'risks'))
+
+# Sort order by severity (critical > high > medium > low)
+_SEVERITY_ORDER = {'critical': 0, 'high': 1, 'medium': 2, 'low': 3}
+
+
 def analyze_uncertainty_sources(
     canonical_record: Dict[str, Any],
-    confidence_flags: Optional[ConfidenceFlagsDomain]
+    confidence_flags: Optional[ConfidenceFlagsFast]
 ) -> List[Dict[str, Any]]:
     """Analyze canonical record and confidence flags for uncertainty sources"""
     uncertainties = []
 
     # Check for missing/null canonical fields
-    canonical_domains = ['financials', 'product', 'customers', 'operations', 'technology', 'growth', 'risks', 'seller']
-
-    for domain in canonical_domains:
+    for domain in _CANONICAL_DOMAINS:
         if not canonical_record.get(domain):
             uncertainties.append({
                 'field': f'{domain}.missing',
                 'type': 'missing_domain',
-                'severity': 'high' if domain in ['financials', 'customers', 'risks'] else 'medium'
+                'severity': 'high' if domain in _HIGH_SEVERITY_DOMAINS else 'medium'
             })
 
     # Check confidence flags for specific uncertainties
@@ -475,9 +617,7 @@ def analyze_uncertainty_sources(
     seen_fields = set()
     prioritized_uncertainties = []
 
-    # Sort by severity (critical > high > medium > low)
-    severity_order = {'critical': 0, 'high': 1, 'medium': 2, 'low': 3}
-    uncertainties.sort(key=lambda x: severity_order.get(x['severity'], 4))
+    uncertainties.sort(key=lambda x: _SEVERITY_ORDER.get(x['severity'], 4))
 
     for uncertainty in uncertainties[:8]:  # Max 8 questions
         if uncertainty['field'] not in seen_fields:
@@ -487,12 +627,8 @@ def analyze_uncertainty_sources(
     return prioritized_uncertainties
 
 
-def generate_question_for_uncertainty(uncertainty: Dict[str, Any]) -> str:
-    """Generate a specific question for a given uncertainty"""
-    field = uncertainty['field']
-    uncertainty_type = uncertainty['type']
-
-    question_templates = {
+# Static question templates, hoisted so they aren't rebuilt per uncertainty
+_QUESTION_TEMPLATES = {
         'financials.missing_financial_data': "Can you provide detailed financial statements for the past 12-24 months, including revenue, expenses, and profit/loss?",
         'financials.missing': "What are the current monthly/annual revenue figures and profit margins for this business?",
         'customers.missing': "Can you provide details about customer count, churn rate, and any large customer concentrations?",
@@ -505,11 +641,19 @@ def generate_question_for_uncertainty(uncertainty: Dict[str, Any]) -> str:
         'product.missing': "What is the core product offering and target market for this business?",
         'growth.missing': "What are the primary growth channels and recent growth trends?",
         'seller.missing': "What is the seller's motivation for selling and timeline for transition?"
-    }
+}
+
+
+@lru_cache(maxsize=512)
+def generate_question_for_uncertainty(field: str, uncertainty_type: str) -> str:
+    """Generate a specific question for a given (field, type) uncertainty
 
+    Takes the hashable pair directly rather than the uncertainty dict so
+    repeated uncertainties across listings hit the memo cache.
+    """
     # Try specific template first
-    if field in question_templates:
-        return question_templates[field]
+    if field in _QUESTION_TEMPLATES:
+        return _QUESTION_TEMPLATES[field]
 
     # Fallback to generic template based on type
     if uncertainty_type == 'missing_domain':
@@ -527,26 +671,43 @@ def insert_follow_up_questions(
     """Insert follow-up questions into database"""
     from models import FollowUpQuestion as DBFollowUpQuestion
 
-    inserted_ids = []
-    for question in questions:
-        db_question = DBFollowUpQuestion(
-            business_id=business_id,
-            canonical_record_id=canonical_record_id,
-            question_text=question.question_text,
-            triggered_by_field=question.triggered_by_field,
-            severity=question.severity
-        )
+    if not questions:
+        return []
+
+    # One multi-row INSERT ... RETURNING id instead of per-row ORM flushes.
+    # Python-side column defaults don't apply to Core inserts, so they are
+    # filled in explicitly here.
+    now = datetime.utcnow()
+    rows = [
+        {
+            "id": str(uuid4()),
+            "business_id": business_id,
+            "canonical_record_id": canonical_record_id,
+            "question_text": question.question_text,
+            "triggered_by_field": question.triggered_by_field,
+            "severity": question.severity,
+            "response_status": "pending",
+            "created_at": now,
+        }
+        for question in questions
+    ]
 
-        session.add(db_question)
-        session.commit()
-        session.refresh(db_question)
-        inserted_ids.append(db_question.id)
+    result = session.execute(
+        pg_insert(DBFollowUpQuestion).returning(DBFollowUpQuestion.id), rows
+    )
+    inserted_ids = [row.id for row in result]
+    session.commit()
 
     return inserted_ids
 
 
 # =============================================================================
 # LLM INTEGRATION AND PROMPTING
+#
+# Prompt layout is deliberately static-first: role, rules and the (cached,
+# byte-identical) schema dump live in the system message, and all per-listing
+# inputs go at the tail of the user message. This keeps the invariant prefix
+# identical across calls so OpenAI's automatic prefix caching can apply.
 # =============================================================================
 
 SYSTEM_PROMPT = """
@@ -664,30 +825,112 @@ SCHEMA: {schema}
 Generate targeted follow-up questions based on the identified uncertainties:
 """
 
+def _system_message(text: str):
+    """Build the system message tuple for a prompt, with cache hints if needed.
+
+    On Anthropic/Bedrock backends the invariant instructions+schema block is
+    tagged with an ephemeral cache_control checkpoint so it is cached at the
+    provider; OpenAI backends keep the plain string form since their prefix
+    caching is automatic.
+    """
+    if LLM_PROVIDER == "anthropic":
+        return ("system", [{"type": "text", "text": text, "cache_control": {"type": "ephemeral"}}])
+    return ("system", text)
+
+
+@lru_cache(maxsize=1)
 def create_extraction_prompt() -> ChatPromptTemplate:
-    """Create the LLM prompt for data extraction"""
+    """Create the LLM prompt for data extraction (compiled once and cached)"""
     return ChatPromptTemplate.from_messages([
-        ("system", SYSTEM_PROMPT),
+        _system_message(SYSTEM_PROMPT),
         ("user", "Raw Text: {raw_text}\n\nHTML: {raw_html}\n\nMetadata: {metadata}")
     ])
 
 
+@lru_cache(maxsize=1)
 def create_scoring_prompt() -> ChatPromptTemplate:
-    """Create the LLM prompt for business scoring"""
+    """Create the LLM prompt for business scoring (compiled once and cached)"""
     return ChatPromptTemplate.from_messages([
-        ("system", SCORING_SYSTEM_PROMPT),
+        _system_message(SCORING_SYSTEM_PROMPT),
         ("user", "Canonical Business Data: {canonical_data}")
     ])
 
 
+@lru_cache(maxsize=1)
 def create_followup_prompt() -> ChatPromptTemplate:
-    """Create the LLM prompt for follow-up question generation"""
+    """Create the LLM prompt for follow-up question generation (compiled once and cached)"""
     return ChatPromptTemplate.from_messages([
-        ("system", FOLLOWUP_SYSTEM_PROMPT),
+        _system_message(FOLLOWUP_SYSTEM_PROMPT),
         ("user", "Uncertainties: {uncertainties}\n\nCanonical Data: {canonical_data}")
     ])
 
 
+@lru_cache(maxsize=1)
+def create_batch_scoring_prompt() -> ChatPromptTemplate:
+    """Create the LLM prompt for scoring a batch of businesses in one call"""
+    return ChatPromptTemplate.from_messages([
+        _system_message(SCORING_SYSTEM_PROMPT),
+        ("user", "Score each of the following canonical business records independently. "
+                 "Respond with a JSON array containing exactly one scoring object per record, "
+                 "in the same order as the input.\n\nRecords:\n{records_json}")
+    ])
+
+
+# Chain singletons: the ChatOpenAI client, the JsonOutputParser (whose
+# pydantic_object wiring is not free to rebuild) and the composed chain are
+# all invariant per process, so each is built once on first use.
+
+@lru_cache(maxsize=1)
+def get_llm() -> "ChatOpenAI":
+    """Shared ChatOpenAI client used by every chain in this module"""
+    from langchain_openai import ChatOpenAI
+    return ChatOpenAI(model=MODEL_ID, temperature=0)
+
+
+@lru_cache(maxsize=1)
+def get_extraction_chain():
+    """Singleton prompt | llm | parser chain for canonical extraction"""
+    return create_extraction_prompt() | get_llm() | JsonOutputParser(pydantic_object=CanonicalRecord)
+
+
+@lru_cache(maxsize=1)
+def get_scoring_chain():
+    """Singleton prompt | llm | parser chain for business scoring"""
+    from schemas_scoring import ScoringOutput
+    return create_scoring_prompt() | get_llm() | JsonOutputParser(pydantic_object=ScoringOutput)
+
+
+@lru_cache(maxsize=1)
+def get_followup_chain():
+    """Singleton prompt | llm | parser chain for follow-up question generation"""
+    from schemas_followup import FollowUpQuestionsOutput
+    return create_followup_prompt() | get_llm() | JsonOutputParser(pydantic_object=FollowUpQuestionsOutput)
+
+
+@lru_cache(maxsize=1)
+def get_batch_scoring_chain():
+    """Singleton prompt | llm | parser chain for batched scoring"""
+    return create_batch_scoring_prompt() | get_llm() | JsonOutputParser()
+
+
+@lru_cache(maxsize=1)
+def create_batch_extraction_prompt() -> ChatPromptTemplate:
+    """Create the LLM prompt for extracting several listings in one call"""
+    return ChatPromptTemplate.from_messages([
+        _system_message(SYSTEM_PROMPT),
+        ("user", "Extract one canonical record per listing below. Respond with a JSON "
+                 "array containing exactly one record object per listing, in the same "
+                 "order as the input.\n\nListings:\n{listings_json}")
+    ])
+
+
+@lru_cache(maxsize=1)
+def get_batch_extraction_chain():
+    """Singleton prompt | llm | parser chain for batched extraction"""
+    from schemas_canonical import CanonicalRecordBatch
+    return create_batch_extraction_prompt() | get_llm() | JsonOutputParser(pydantic_object=CanonicalRecordBatch)
+
+
 # =============================================================================
 # LANGGRAPH NODE IMPLEMENTATION
 # =============================================================================
@@ -708,42 +951,101 @@ def categorize_listing(state: CategorizationState) -> CategorizationState:
         input_snapshot={
             "raw_listing_id": state["raw_listing_id"],
             "agent_run_id": state["agent_run_id"],
-            "raw_text_length": len(state["raw_text"]),
-            "raw_html_length": len(state["raw_html"])
+            "raw_text_length": len(state["raw_text"] or ""),
+            "raw_html_length": len(state["raw_html"] or "")
         }
     ) as logger:
-        # Initialize LLM (assuming OpenAI GPT-4 for structured output)
-        from langchain_openai import ChatOpenAI
-        llm = ChatOpenAI(model="gpt-5-mini", temperature=0)
-
-    # Create extraction chain
-    prompt = create_extraction_prompt()
-    parser = JsonOutputParser(pydantic_object=CanonicalRecord)
-    chain = prompt | llm | parser
+        # Shared extraction chain (client, prompt and parser are singletons)
+        chain = get_extraction_chain()
 
     try:
-        # Extract canonical data using LLM
-        raw_result = chain.invoke({
-            "raw_text": state["raw_text"],
-            "raw_html": state["raw_html"],
-            "metadata": json.dumps(state["listing_metadata"]),
-            "schema": json.dumps(CanonicalRecord.model_json_schema())
-        })
+        session = get_session_sync()
+        try:
+            raw_text = state["raw_text"]
+            raw_html = state["raw_html"]
+            if raw_text is None or raw_html is None:
+                # Caller passed only the reference; pull the blobs here so
+                # they never ride through the graph state
+                from models import RawListing
+                row = session.execute(
+                    select(RawListing.raw_text, RawListing.raw_html).where(
+                        RawListing.id == state["raw_listing_id"]
+                    ).limit(1)
+                ).first()
+                if row is None:
+                    raise ValueError(
+                        f"Raw listing {state['raw_listing_id']} not found"
+                    )
+                raw_text = row.raw_text or ""
+                raw_html = row.raw_html or ""
+
+            # Calculate content hash for versioning and cache lookup
+            content_hash = calculate_content_hash(
+                raw_text,
+                raw_html,
+                state["listing_metadata"]
+            )
 
-        # Validate with Pydantic model
-        canonical_data = CanonicalRecord(**raw_result)
+            # Exact-content short circuit: if this hash already produced a
+            # canonical record, reuse it without touching the LLM at all
+            # (backed by the unique (business_id, content_hash) index)
+            existing = session.query(CanonicalBusinessRecord).filter(
+                CanonicalBusinessRecord.business_id == state["business_id"],
+                CanonicalBusinessRecord.content_hash == content_hash
+            ).first()
+            if existing is not None:
+                logger.log_success({
+                    "record_id": existing.id,
+                    "content_hash": content_hash,
+                    "reused_existing_record": True
+                })
+                return {
+                    "raw_text": "",
+                    "raw_html": "",
+                    "canonical_record": {
+                        "record_id": existing.id,
+                        "data": {
+                            domain: getattr(existing, domain)
+                            for domain in _CANONICAL_DOMAINS + ('confidence_flags',)
+                            if getattr(existing, domain) is not None
+                        },
+                        "content_hash": content_hash,
+                        "version": existing.version
+                    }
+                }
 
-        # Calculate content hash for versioning
-        content_hash = calculate_content_hash(
-            state["raw_text"],
-            state["raw_html"],
-            state["listing_metadata"]
-        )
+            # Check the LLM response cache before calling the model
+            raw_result = get_cached_llm_response(
+                "extraction", EXTRACTION_PROMPT_VERSION, content_hash, session
+            )
+            if raw_result is not None:
+                try:
+                    canonical_data = CanonicalRecord(**raw_result)
+                except ValidationError:
+                    # Stale or corrupt cache entry - evict and fall through to the LLM
+                    evict_llm_cache_entry(
+                        "extraction", EXTRACTION_PROMPT_VERSION, content_hash, session
+                    )
+                    raw_result = None
+
+            if raw_result is None:
+                # Extract canonical data using LLM
+                raw_result = chain.invoke({
+                    "raw_text": raw_text,
+                    "raw_html": raw_html,
+                    "metadata": _json_dumps(state["listing_metadata"]),
+                    "schema": _schema_json(CanonicalRecord)
+                })
 
-        # Insert into database with versioning
-        session = get_session_sync()
-        try:
-            record_id = insert_canonical_record(
+                # Validate with Pydantic model
+                canonical_data = CanonicalRecord(**raw_result)
+
+                store_llm_response(
+                    "extraction", EXTRACTION_PROMPT_VERSION, content_hash, raw_result, session
+                )
+
+            # Insert into database with versioning
+            record_id, version = insert_canonical_record(
                 business_id=state["business_id"],
                 agent_run_id=state["agent_run_id"],
                 canonical_data=canonical_data,
@@ -751,21 +1053,28 @@ def categorize_listing(state: CategorizationState) -> CategorizationState:
                 session=session
             )
 
-            # Return updated state with canonical record
+            # Return updated state with canonical record; exclude_none keeps
+            # the state payload (and downstream prompts built from it) free
+            # of null-only keys
+            canonical_state_data = canonical_data.model_dump(mode="json", exclude_none=True)
+
             logger.log_success({
                 "model_name": "gpt-5-mini",
                 "record_id": record_id,
                 "content_hash": content_hash,
-                "canonical_domains_extracted": len([k for k, v in canonical_data.dict().items() if v is not None])
+                "canonical_domains_extracted": len(canonical_state_data)
             })
 
             return {
-                **state,
+                # Partial update: downstream nodes never read the raw blobs,
+                # so clear them instead of copying them through two more nodes
+                "raw_text": "",
+                "raw_html": "",
                 "canonical_record": {
                     "record_id": record_id,
-                    "data": canonical_data.dict(),
+                    "data": canonical_state_data,
                     "content_hash": content_hash,
-                    "version": get_latest_version(state["business_id"], session)[0]
+                    "version": version
                 }
             }
 
@@ -777,7 +1086,6 @@ def categorize_listing(state: CategorizationState) -> CategorizationState:
 
             # Log validation error and return state with error
             return {
-                **state,
                 "canonical_record": {
                     "error": "schema_validation_failed",
                     "details": str(e)
@@ -791,7 +1099,6 @@ def categorize_listing(state: CategorizationState) -> CategorizationState:
             })
 
             return {
-                **state,
                 "canonical_record": {
                     "error": "extraction_failed",
                     "details": str(e)
@@ -807,7 +1114,6 @@ def categorize_listing(state: CategorizationState) -> CategorizationState:
             "business_id": state.get("business_id")
         })
         return {
-            **state,
             "canonical_record": {
                 "error": "unexpected_error",
                 "details": str(e)
@@ -842,7 +1148,6 @@ def score_business(state: CategorizationState) -> CategorizationState:
                 "missing_field": "canonical_record_id"
             })
             return {
-                **state,
                 "scoring_output": {
                     "error": "no_canonical_record_id"
                 }
@@ -851,21 +1156,23 @@ def score_business(state: CategorizationState) -> CategorizationState:
         # Load canonical record from database
     session = get_session_sync()
     try:
-        from models import CanonicalBusinessRecord
-        canonical_record = session.query(CanonicalBusinessRecord).filter(
-            CanonicalBusinessRecord.id == state["canonical_record_id"]
+        # Column select instead of full ORM row - the node only reads these
+        # values into the prompt payload
+        canonical_record = session.execute(
+            _canonical_columns_select().where(
+                CanonicalBusinessRecord.id == state["canonical_record_id"]
+            ).limit(1)
         ).first()
 
         if not canonical_record:
             return {
-                **state,
                 "scoring_output": {
                     "error": "canonical_record_not_found"
                 }
             }
 
         # Prepare canonical data for LLM
-        canonical_data = {
+        canonical_data = _compact({
             "financials": canonical_record.financials,
             "product": canonical_record.product,
             "customers": canonical_record.customers,
@@ -875,37 +1182,51 @@ def score_business(state: CategorizationState) -> CategorizationState:
             "risks": canonical_record.risks,
             "seller": canonical_record.seller,
             "confidence_flags": canonical_record.confidence_flags,
-        }
+        })
 
-        # Initialize LLM for scoring
-        from langchain_openai import ChatOpenAI
-        llm = ChatOpenAI(model="gpt-5-mini", temperature=0)
+        # Shared scoring chain (client, prompt and parser are singletons)
+        from schemas_scoring import ScoringOutput
+        chain = get_scoring_chain()
 
-        # Create scoring chain
-        prompt = create_scoring_prompt()
-        parser = JsonOutputParser(pydantic_object=ScoringOutput)
-        chain = prompt | llm | parser
+        # Check the LLM response cache before calling the model
+        raw_result = get_cached_llm_response(
+            "scoring", SCORING_PROMPT_VERSION, canonical_record.content_hash, session
+        )
+        if raw_result is not None:
+            try:
+                scoring_output = parse_scoring_output(raw_result)
+            except (ValidationError, msgspec.ValidationError):
+                # Stale or corrupt cache entry - evict and fall through to the LLM
+                evict_llm_cache_entry(
+                    "scoring", SCORING_PROMPT_VERSION, canonical_record.content_hash, session
+                )
+                raw_result = None
+
+        if raw_result is None:
+            # Get scoring output from LLM
+            raw_result = chain.invoke({
+                "canonical_data": _json_dumps(canonical_data),
+                "schema": _schema_json(ScoringOutput)
+            })
 
-        # Get scoring output from LLM
-        raw_result = chain.invoke({
-            "canonical_data": json.dumps(canonical_data),
-            "schema": json.dumps(ScoringOutput.model_json_schema())
-        })
+            log.debug("Raw LLM result: %r", raw_result)
 
-        print(f"DEBUG: Raw LLM result: {raw_result}")
+            # Validate with Pydantic model
+            try:
+                scoring_output = parse_scoring_output(raw_result)
+            except Exception as validation_error:
+                log.debug("Validation error: %s (raw result type %s)",
+                          validation_error, type(raw_result))
+                raise validation_error
 
-        # Validate with Pydantic model
-        try:
-            scoring_output = ScoringOutput(**raw_result)
-        except Exception as validation_error:
-            print(f"DEBUG: Validation error: {validation_error}")
-            print(f"DEBUG: Raw result type: {type(raw_result)}")
-            raise validation_error
+            store_llm_response(
+                "scoring", SCORING_PROMPT_VERSION, canonical_record.content_hash, raw_result, session
+            )
 
         # Apply data quality penalties
         confidence_flags = None
         if canonical_record.confidence_flags:
-            confidence_flags = ConfidenceFlagsDomain(**canonical_record.confidence_flags)
+            confidence_flags = load_confidence_flags(canonical_record.confidence_flags)
 
         penalized_scores = apply_data_quality_penalties(
             scoring_output.component_scores,
@@ -918,7 +1239,6 @@ def score_business(state: CategorizationState) -> CategorizationState:
         # Validate final output
         if not validate_scoring_output(scoring_output):
             return {
-                **state,
                 "scoring_output": {
                     "error": "validation_failed",
                     "details": "Scoring output failed validation"
@@ -949,11 +1269,10 @@ def score_business(state: CategorizationState) -> CategorizationState:
         })
 
         return {
-            **state,
             "scoring_run_id": scoring_run_id,
             "scoring_output": {
                 "record_id": record_id,
-                "component_scores": scoring_output.component_scores.dict(),
+                "component_scores": scoring_output.component_scores.model_dump(mode="json"),
                 "top_buy_reasons": scoring_output.top_buy_reasons,
                 "top_risks": scoring_output.top_risks,
                 "total_score": total_score,
@@ -968,7 +1287,6 @@ def score_business(state: CategorizationState) -> CategorizationState:
         })
 
         return {
-            **state,
             "scoring_output": {
                 "error": "schema_validation_failed",
                 "details": str(e)
@@ -981,7 +1299,6 @@ def score_business(state: CategorizationState) -> CategorizationState:
         })
 
         return {
-            **state,
             "scoring_output": {
                 "error": "scoring_failed",
                 "details": str(e)
@@ -1008,14 +1325,12 @@ def generate_follow_up_questions(state: CategorizationState) -> CategorizationSt
     # Check gating criteria
     if not state.get("scoring_output") or not should_generate_follow_up_questions(state["scoring_output"]):
         return {
-            **state,
             "follow_up_questions": []
         }
 
     # Validate required data
     if not state.get("canonical_record_id") or not state.get("canonical_record"):
         return {
-            **state,
             "follow_up_questions": {
                 "error": "missing_canonical_data"
             }
@@ -1024,41 +1339,61 @@ def generate_follow_up_questions(state: CategorizationState) -> CategorizationSt
     # Analyze uncertainties from canonical record
     confidence_flags = None
     if state["canonical_record"].get("confidence_flags"):
-        confidence_flags = ConfidenceFlagsDomain(**state["canonical_record"]["confidence_flags"])
+        confidence_flags = load_confidence_flags(state["canonical_record"]["confidence_flags"])
 
     uncertainties = analyze_uncertainty_sources(state["canonical_record"], confidence_flags)
 
     # If no significant uncertainties, skip question generation
     if not uncertainties:
         return {
-            **state,
             "follow_up_questions": []
         }
 
     # Generate questions using LLM
     try:
-        from langchain_openai import ChatOpenAI
-        llm = ChatOpenAI(model="gpt-5-mini", temperature=0)
+        # Shared follow-up chain (client, prompt and parser are singletons)
+        from schemas_followup import FollowUpQuestionsOutput
+        chain = get_followup_chain()
 
-        prompt = create_followup_prompt()
-        parser = JsonOutputParser(pydantic_object=FollowUpQuestionsOutput)
-        chain = prompt | llm | parser
+        uncertainties_json = _json_dumps(uncertainties)
+        canonical_data_json = _json_dumps(state["canonical_record"])
 
-        uncertainties_json = json.dumps(uncertainties)
-        canonical_data_json = json.dumps(state["canonical_record"])
+        content_hash = state["canonical_record"].get("content_hash")
 
-        raw_result = chain.invoke({
-            "uncertainties": uncertainties_json,
-            "canonical_data": canonical_data_json,
-            "schema": json.dumps(FollowUpQuestionsOutput.model_json_schema())
-        })
-
-        # Validate with Pydantic model
-        followup_output = FollowUpQuestionsOutput(**raw_result)
-
-        # Insert questions into database
         session = get_session_sync()
         try:
+            # Check the LLM response cache before calling the model
+            raw_result = None
+            if content_hash:
+                raw_result = get_cached_llm_response(
+                    "followup", FOLLOWUP_PROMPT_VERSION, content_hash, session
+                )
+            if raw_result is not None:
+                try:
+                    followup_output = parse_followup_output(raw_result)
+                except (ValidationError, msgspec.ValidationError):
+                    # Stale or corrupt cache entry - evict and fall through to the LLM
+                    evict_llm_cache_entry(
+                        "followup", FOLLOWUP_PROMPT_VERSION, content_hash, session
+                    )
+                    raw_result = None
+
+            if raw_result is None:
+                raw_result = chain.invoke({
+                    "uncertainties": uncertainties_json,
+                    "canonical_data": canonical_data_json,
+                    "schema": _schema_json(FollowUpQuestionsOutput)
+                })
+
+                # Validate with Pydantic model
+                followup_output = parse_followup_output(raw_result)
+
+                if content_hash:
+                    store_llm_response(
+                        "followup", FOLLOWUP_PROMPT_VERSION, content_hash, raw_result, session
+                    )
+
+            # Insert questions into database
             question_ids = insert_follow_up_questions(
                 business_id=state["business_id"],
                 canonical_record_id=state["canonical_record_id"],
@@ -1077,7 +1412,6 @@ def generate_follow_up_questions(state: CategorizationState) -> CategorizationSt
                 })
 
             return {
-                **state,
                 "follow_up_questions": {
                     "questions": questions_data,
                     "count": len(questions_data)
@@ -1089,7 +1423,6 @@ def generate_follow_up_questions(state: CategorizationState) -> CategorizationSt
 
     except ValidationError as e:
         return {
-            **state,
             "follow_up_questions": {
                 "error": "schema_validation_failed",
                 "details": str(e)
@@ -1097,7 +1430,6 @@ def generate_follow_up_questions(state: CategorizationState) -> CategorizationSt
         }
     except Exception as e:
         return {
-            **state,
             "follow_up_questions": {
                 "error": "followup_generation_failed",
                 "details": str(e)
@@ -1109,29 +1441,297 @@ def generate_follow_up_questions(state: CategorizationState) -> CategorizationSt
 # LANGGRAPH DEFINITION
 # =============================================================================
 
+def _categorize_cache_key(state: CategorizationState) -> str:
+    """Node-cache key for categorize_listing: content only, not per-run ids.
+
+    The default key pickles the whole state, and agent_run_id is a fresh
+    uuid per request, so every invocation would miss; hashing just the
+    deterministic inputs lets re-submissions of identical listings hit.
+    When the blobs are lazy-loaded (None in state) the immutable
+    raw_listing_id stands in for them.
+    """
+    if state["raw_text"] is None or state["raw_html"] is None:
+        return state["business_id"] + ":" + state["raw_listing_id"]
+    return state["business_id"] + ":" + calculate_content_hash(
+        state["raw_text"], state["raw_html"], state["listing_metadata"]
+    )
+
+
+def _score_cache_key(state: CategorizationState) -> str:
+    """Node-cache key for score_business: the canonical record it scores."""
+    digest = hashlib.blake2b(
+        orjson.dumps(state.get("canonical_record"), option=orjson.OPT_SORT_KEYS),
+        digest_size=32,
+    ).hexdigest()
+    return state["business_id"] + ":" + digest
+
+
+def _follow_up_cache_key(state: CategorizationState) -> str:
+    """Node-cache key for follow-up generation: scoring output + record."""
+    digest = hashlib.blake2b(
+        orjson.dumps(
+            {
+                "canonical_record": state.get("canonical_record"),
+                "scoring_output": state.get("scoring_output"),
+            },
+            option=orjson.OPT_SORT_KEYS,
+        ),
+        digest_size=32,
+    ).hexdigest()
+    return state["business_id"] + ":" + digest
+
+
+@lru_cache(maxsize=1)
 def create_categorization_graph() -> StateGraph:
     """
     Create the complete LangGraph for business categorization, scoring, and follow-up.
 
     This graph processes one raw listing at a time through the full acquisition pipeline:
     categorization → scoring → follow-up questions (conditional).
+
+    Compiled once and cached - the graph is stateless between invocations, so
+    callers (API endpoints included) always get the same compiled instance.
     """
     # Create graph builder
     builder = StateGraph(CategorizationState)
 
-    # Add nodes
-    builder.add_node("categorize_listing", categorize_listing)
-    builder.add_node("score_business", score_business)
-    builder.add_node("generate_follow_up_questions", generate_follow_up_questions)
+    # Add nodes. Each gets a node-level cache policy keyed on its
+    # deterministic inputs: re-running an unchanged listing within the TTL
+    # returns the memoized state delta without entering the node at all,
+    # sitting above the content-hash / llm_cache short circuits inside.
+    builder.add_node(
+        "categorize_listing", categorize_listing,
+        cache_policy=CachePolicy(key_func=_categorize_cache_key, ttl=3600),
+    )
+    builder.add_node(
+        "score_business", score_business,
+        cache_policy=CachePolicy(key_func=_score_cache_key, ttl=3600),
+    )
+    builder.add_node(
+        "generate_follow_up_questions", generate_follow_up_questions,
+        cache_policy=CachePolicy(key_func=_follow_up_cache_key, ttl=3600),
+    )
 
     # Define the flow: START → categorize_listing → score_business → generate_follow_up_questions → END
     builder.add_edge(START, "categorize_listing")
     builder.add_edge("categorize_listing", "score_business")
-    builder.add_edge("score_business", "generate_follow_up_questions")
+    # Gate the follow-up node with a conditional edge so listings that fail
+    # the tier/score criteria (the common case) never schedule it at all
+    builder.add_conditional_edges(
+        "score_business",
+        lambda state: "followup" if should_generate_follow_up_questions(
+            state.get("scoring_output") or {}
+        ) else "end",
+        {"followup": "generate_follow_up_questions", "end": END},
+    )
     builder.add_edge("generate_follow_up_questions", END)
 
-    # Compile the graph
-    return builder.compile()
+    # Compile with the in-process cache backing the node policies above
+    return builder.compile(cache=InMemoryCache())
+
+
+async def process_listings_concurrently(
+    initial_states: List[CategorizationState],
+    max_concurrency: int = 5,
+) -> List[CategorizationState]:
+    """Run the categorization graph over many listings concurrently.
+
+    The three LLM stages for a single listing are data-dependent and stay
+    sequential, but across listings the network/LLM latency overlaps; a
+    semaphore caps in-flight runs to stay under provider rate limits.
+    """
+    graph = create_categorization_graph()
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run_one(state: CategorizationState) -> CategorizationState:
+        async with semaphore:
+            # ainvoke runs the sync node bodies in the default executor, so
+            # listings overlap on network/LLM latency without blocking the loop
+            return await graph.ainvoke(state)
+
+    return list(await asyncio.gather(*(run_one(state) for state in initial_states)))
+
+
+async def run_batch(
+    states: List[CategorizationState],
+    max_concurrency: int = 5,
+) -> List[CategorizationState]:
+    """Batch entry point for ingestion: run the full graph over many listings.
+
+    process_listing_example is the single-item specialization of this.
+    """
+    return await process_listings_concurrently(states, max_concurrency)
+
+
+# Batch scoring: the ~1.5KB scoring rubric dominates per-call prompt tokens,
+# so scoring several records per LLM call amortizes it. Kept small so one bad
+# record doesn't poison too large a batch.
+SCORING_BATCH_SIZE = 5
+SCORING_BATCH_WINDOW_SECONDS = 0.05
+
+
+async def score_batch(records: List[Dict[str, Any]]) -> List[ScoringOutput]:
+    """
+    Score multiple canonical business records in a single LLM call.
+
+    Sends the scoring rubric once with a JSON array of records and expects a
+    JSON array of scoring objects back, one per record in input order. Each
+    element is validated independently via parse_scoring_output.
+    """
+    from schemas_scoring import ScoringOutput
+
+    if not records:
+        return []
+
+    chain = get_batch_scoring_chain()
+
+    raw_results = await chain.ainvoke({
+        "records_json": _json_dumps(records),
+        "schema": _schema_json(ScoringOutput)
+    })
+
+    if not isinstance(raw_results, list) or len(raw_results) != len(records):
+        raise ValueError(
+            f"Batch scoring returned {len(raw_results) if isinstance(raw_results, list) else type(raw_results).__name__} "
+            f"results for {len(records)} records"
+        )
+
+    return [parse_scoring_output(raw_result) for raw_result in raw_results]
+
+
+class ScoringBatcher:
+    """
+    Micro-batching front end for score_batch.
+
+    Callers await submit(record) individually; a drain task collects requests
+    for up to SCORING_BATCH_WINDOW_SECONDS (or until SCORING_BATCH_SIZE queue
+    up) and issues one LLM call per window, resolving each caller's future
+    with its own ScoringOutput.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = SCORING_BATCH_SIZE,
+        window_seconds: float = SCORING_BATCH_WINDOW_SECONDS,
+    ):
+        self._batch_size = batch_size
+        self._window_seconds = window_seconds
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._drain_task: Optional[asyncio.Task] = None
+
+    async def submit(self, record: Dict[str, Any]) -> ScoringOutput:
+        """Queue one canonical record for scoring and await its result"""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((record, future))
+        if self._drain_task is None or self._drain_task.done():
+            self._drain_task = asyncio.create_task(self._drain())
+        return await future
+
+    async def _drain(self) -> None:
+        while not self._queue.empty():
+            batch = [await self._queue.get()]
+            while len(batch) < self._batch_size:
+                try:
+                    batch.append(await asyncio.wait_for(
+                        self._queue.get(), timeout=self._window_seconds
+                    ))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                outputs = await score_batch([record for record, _ in batch])
+            except Exception as batch_error:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(batch_error)
+                continue
+
+            for (_, future), output in zip(batch, outputs):
+                if not future.done():
+                    future.set_result(output)
+
+
+EXTRACTION_BATCH_SIZE = 5
+
+
+def categorize_listings_batch(
+    states: List[CategorizationState],
+    batch_size: int = EXTRACTION_BATCH_SIZE,
+) -> List[CategorizationState]:
+    """
+    Extract canonical records for many listings with one LLM call per batch.
+
+    The extraction schema and instructions are identical across listings, so
+    groups of batch_size listings share a single prompt and the model emits a
+    JSON array of canonical records. raw_html is omitted from the batched
+    prompt to keep it within budget; content hashes still cover it. Each
+    batch's records are inserted in one DB transaction.
+    """
+    results: List[CategorizationState] = []
+
+    for start in range(0, len(states), batch_size):
+        window = states[start:start + batch_size]
+        listings = [
+            {
+                "index": position,
+                "raw_text": state["raw_text"],
+                "metadata": state["listing_metadata"],
+            }
+            for position, state in enumerate(window)
+        ]
+
+        raw_results = get_batch_extraction_chain().invoke({
+            "listings_json": _json_dumps(listings),
+            "schema": _schema_json(CanonicalRecord)
+        })
+
+        if not isinstance(raw_results, list) or len(raw_results) != len(window):
+            raise ValueError(
+                f"Batch extraction returned {len(raw_results) if isinstance(raw_results, list) else type(raw_results).__name__} "
+                f"records for {len(window)} listings"
+            )
+
+        session = get_session_sync()
+        try:
+            batch_results = []
+            for state, raw_result in zip(window, raw_results):
+                canonical_data = CanonicalRecord(**raw_result)
+                content_hash = calculate_content_hash(
+                    state["raw_text"] or "",
+                    state["raw_html"] or "",
+                    state["listing_metadata"]
+                )
+                record_id, version = insert_canonical_record(
+                    business_id=state["business_id"],
+                    agent_run_id=state["agent_run_id"],
+                    canonical_data=canonical_data,
+                    content_hash=content_hash,
+                    session=session,
+                    commit=False
+                )
+                batch_results.append({
+                    **state,
+                    "canonical_record": {
+                        "record_id": record_id,
+                        "data": canonical_data.model_dump(mode="json", exclude_none=True),
+                        "content_hash": content_hash,
+                        "version": version
+                    },
+                    "canonical_record_id": record_id
+                })
+
+            # One commit per batch; cache versions only once they are durable
+            session.commit()
+            for result in batch_results:
+                record = result["canonical_record"]
+                _latest_version_cache.put(
+                    result["business_id"], record["version"], record["content_hash"]
+                )
+            results.extend(batch_results)
+        finally:
+            session.close()
+
+    return results
 
 
 # =============================================================================
@@ -1146,17 +1746,19 @@ def run_standalone_scoring(business_id: str) -> dict:
     # Get database session
     session = get_session_sync()
     try:
-        from models import CanonicalBusinessRecord
-        # Get the latest canonical record for this business
-        canonical_record = session.query(CanonicalBusinessRecord).filter(
-            CanonicalBusinessRecord.business_id == business_id
-        ).order_by(CanonicalBusinessRecord.created_at.desc()).first()
+        # Get the latest canonical record for this business (column select;
+        # no ORM hydration needed for prompt building)
+        canonical_record = session.execute(
+            _canonical_columns_select().where(
+                CanonicalBusinessRecord.business_id == business_id
+            ).order_by(CanonicalBusinessRecord.created_at.desc()).limit(1)
+        ).first()
 
         if not canonical_record:
             return {"error": "no_canonical_record_found"}
 
         # Prepare canonical data for LLM
-        canonical_data = {
+        canonical_data = _compact({
             "financials": canonical_record.financials,
             "product": canonical_record.product,
             "customers": canonical_record.customers,
@@ -1166,37 +1768,51 @@ def run_standalone_scoring(business_id: str) -> dict:
             "risks": canonical_record.risks,
             "seller": canonical_record.seller,
             "confidence_flags": canonical_record.confidence_flags,
-        }
+        })
 
-        # Initialize LLM for scoring
-        from langchain_openai import ChatOpenAI
-        llm = ChatOpenAI(model="gpt-5-mini", temperature=0)
+        # Shared scoring chain (client, prompt and parser are singletons)
+        from schemas_scoring import ScoringOutput
+        chain = get_scoring_chain()
 
-        # Create scoring chain
-        prompt = create_scoring_prompt()
-        parser = JsonOutputParser(pydantic_object=ScoringOutput)
-        chain = prompt | llm | parser
+        # Check the LLM response cache before calling the model
+        raw_result = get_cached_llm_response(
+            "scoring", SCORING_PROMPT_VERSION, canonical_record.content_hash, session
+        )
+        if raw_result is not None:
+            try:
+                scoring_output = parse_scoring_output(raw_result)
+            except (ValidationError, msgspec.ValidationError):
+                # Stale or corrupt cache entry - evict and fall through to the LLM
+                evict_llm_cache_entry(
+                    "scoring", SCORING_PROMPT_VERSION, canonical_record.content_hash, session
+                )
+                raw_result = None
+
+        if raw_result is None:
+            # Get scoring output from LLM
+            raw_result = chain.invoke({
+                "canonical_data": _json_dumps(canonical_data),
+                "schema": _schema_json(ScoringOutput)
+            })
 
-        # Get scoring output from LLM
-        raw_result = chain.invoke({
-            "canonical_data": json.dumps(canonical_data),
-            "schema": json.dumps(ScoringOutput.model_json_schema())
-        })
+            log.debug("Raw LLM result: %r", raw_result)
 
-        print(f"DEBUG: Raw LLM result: {raw_result}")
+            # Validate with Pydantic model
+            try:
+                scoring_output = parse_scoring_output(raw_result)
+            except Exception as validation_error:
+                log.debug("Validation error: %s (raw result type %s)",
+                          validation_error, type(raw_result))
+                raise validation_error
 
-        # Validate with Pydantic model
-        try:
-            scoring_output = ScoringOutput(**raw_result)
-        except Exception as validation_error:
-            print(f"DEBUG: Validation error: {validation_error}")
-            print(f"DEBUG: Raw result type: {type(raw_result)}")
-            raise validation_error
+            store_llm_response(
+                "scoring", SCORING_PROMPT_VERSION, canonical_record.content_hash, raw_result, session
+            )
 
         # Apply data quality penalties
         confidence_flags = None
         if canonical_record.confidence_flags:
-            confidence_flags = ConfidenceFlagsDomain(**canonical_record.confidence_flags)
+            confidence_flags = load_confidence_flags(canonical_record.confidence_flags)
 
         penalized_scores = apply_data_quality_penalties(
             scoring_output.component_scores,
@@ -1231,7 +1847,7 @@ def run_standalone_scoring(business_id: str) -> dict:
             "success": True,
             "record_id": record_id,
             "scoring_run_id": scoring_run_id,
-            "component_scores": scoring_output.component_scores.dict(),
+            "component_scores": scoring_output.component_scores.model_dump(mode="json"),
             "top_buy_reasons": scoring_output.top_buy_reasons,
             "top_risks": scoring_output.top_risks,
             "total_score": total_score,
@@ -1255,11 +1871,18 @@ def run_standalone_followup_generation(business_id: str) -> dict:
     # Get database session
     session = get_session_sync()
     try:
-        from models import ScoringRecord, CanonicalBusinessRecord
-        # Get the latest scoring record for this business
-        scoring_record = session.query(ScoringRecord).filter(
-            ScoringRecord.business_id == business_id
-        ).order_by(ScoringRecord.scoring_timestamp.desc()).first()
+        from models import ScoringRecord
+        # Get the latest scoring record for this business (only the gating
+        # fields and the canonical record pointer are read)
+        scoring_record = session.execute(
+            select(
+                ScoringRecord.tier,
+                ScoringRecord.total_score,
+                ScoringRecord.canonical_record_id,
+            ).where(
+                ScoringRecord.business_id == business_id
+            ).order_by(ScoringRecord.scoring_timestamp.desc()).limit(1)
+        ).first()
 
         if not scoring_record:
             return {"error": "no_scoring_record_found"}
@@ -1276,16 +1899,18 @@ def run_standalone_followup_generation(business_id: str) -> dict:
                 "score": scoring_record.total_score
             }
 
-        # Get canonical record
-        canonical_record = session.query(CanonicalBusinessRecord).filter(
-            CanonicalBusinessRecord.id == scoring_record.canonical_record_id
+        # Get canonical record (column select)
+        canonical_record = session.execute(
+            _canonical_columns_select().where(
+                CanonicalBusinessRecord.id == scoring_record.canonical_record_id
+            ).limit(1)
         ).first()
 
         if not canonical_record:
             return {"error": "canonical_record_not_found"}
 
         # Prepare canonical data for analysis
-        canonical_data = {
+        canonical_data = _compact({
             "financials": canonical_record.financials,
             "product": canonical_record.product,
             "customers": canonical_record.customers,
@@ -1295,12 +1920,12 @@ def run_standalone_followup_generation(business_id: str) -> dict:
             "risks": canonical_record.risks,
             "seller": canonical_record.seller,
             "confidence_flags": canonical_record.confidence_flags,
-        }
+        })
 
         # Analyze uncertainties
         confidence_flags = None
         if canonical_record.confidence_flags:
-            confidence_flags = ConfidenceFlagsDomain(**canonical_record.confidence_flags)
+            confidence_flags = load_confidence_flags(canonical_record.confidence_flags)
 
         uncertainties = analyze_uncertainty_sources(canonical_data, confidence_flags)
 
@@ -1313,25 +1938,40 @@ def run_standalone_followup_generation(business_id: str) -> dict:
                 "message": "No significant uncertainties found"
             }
 
-        # Generate questions using LLM
-        from langchain_openai import ChatOpenAI
-        llm = ChatOpenAI(model="gpt-5-mini", temperature=0)
+        # Generate questions using the shared follow-up chain
+        from schemas_followup import FollowUpQuestionsOutput
+        chain = get_followup_chain()
 
-        prompt = create_followup_prompt()
-        parser = JsonOutputParser(pydantic_object=FollowUpQuestionsOutput)
-        chain = prompt | llm | parser
+        uncertainties_json = _json_dumps(uncertainties)
+        canonical_data_json = _json_dumps(canonical_data)
 
-        uncertainties_json = json.dumps(uncertainties)
-        canonical_data_json = json.dumps(canonical_data)
+        # Check the LLM response cache before calling the model
+        raw_result = get_cached_llm_response(
+            "followup", FOLLOWUP_PROMPT_VERSION, canonical_record.content_hash, session
+        )
+        if raw_result is not None:
+            try:
+                followup_output = parse_followup_output(raw_result)
+            except (ValidationError, msgspec.ValidationError):
+                # Stale or corrupt cache entry - evict and fall through to the LLM
+                evict_llm_cache_entry(
+                    "followup", FOLLOWUP_PROMPT_VERSION, canonical_record.content_hash, session
+                )
+                raw_result = None
+
+        if raw_result is None:
+            raw_result = chain.invoke({
+                "uncertainties": uncertainties_json,
+                "canonical_data": canonical_data_json,
+                "schema": _schema_json(FollowUpQuestionsOutput)
+            })
 
-        raw_result = chain.invoke({
-            "uncertainties": uncertainties_json,
-            "canonical_data": canonical_data_json,
-            "schema": json.dumps(FollowUpQuestionsOutput.model_json_schema())
-        })
+            # Validate with Pydantic model
+            followup_output = parse_followup_output(raw_result)
 
-        # Validate with Pydantic model
-        followup_output = FollowUpQuestionsOutput(**raw_result)
+            store_llm_response(
+                "followup", FOLLOWUP_PROMPT_VERSION, canonical_record.content_hash, raw_result, session
+            )
 
         # Insert questions into database
         question_ids = insert_follow_up_questions(
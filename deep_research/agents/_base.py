@@ -0,0 +1,152 @@
+"""
+Shared skeleton for the sector research agent nodes.
+
+The five agents differ only in prompt, output schema, required keys and
+labels; everything else - cache probe, responses call, parse, validation,
+queued persistence, logging - is this one parametrized node body, so each
+optimization lands once instead of five times.
+"""
+
+from typing import Any, Dict, Optional, Set
+
+from deep_research.llm_client import get_async_client, get_llm_semaphore
+from deep_research.state import DeepResearchState
+from deep_research.db import queue_sector_research_record, sector_research_already_done
+from deep_research.parse_llm_json import extract_json
+from deep_research.llm_cache import cache_key, get_cached_response, store_cached_response
+from utils import log_agent_execution
+
+MODEL_ID = "o4-mini-deep-research"
+PROMPT_VERSION = "v1.0"
+
+
+def make_research_node(
+    agent_type: str,
+    state_key: str,
+    system_prompt: str,
+    user_template: str,
+    output_format: Dict[str, Any],
+    required_keys: Set[str],
+    model_name: str = MODEL_ID,
+    error_defaults: Optional[Dict[str, Any]] = None,
+    error_message: str = "",
+    doc: Optional[str] = None,
+):
+    """
+    Build an async LangGraph node for one research agent.
+
+    If error_defaults is given, failures are logged and returned as that
+    placeholder under state_key; otherwise exceptions propagate to the graph.
+    """
+
+    async def research_node(state: DeepResearchState) -> Dict[str, Any]:
+        sector_description = state["sector_description"]
+
+        with log_agent_execution(
+            agent_name=agent_type,
+            business_id=state.get("business_id"),
+            input_snapshot={
+                "sector_description": sector_description,
+                "sector_key": state.get("sector_key"),
+                "research_run_id": state.get("research_run_id")
+            }
+        ) as logger:
+            try:
+                # Skip the agent outright when this research already exists for
+                # the current prompt version; unlike llm_cache, it never expires
+                existing = sector_research_already_done(
+                    state["sector_key"], agent_type, PROMPT_VERSION
+                )
+                if existing is not None:
+                    logger.log_success({
+                        "model_name": model_name,
+                        "response_length": 0,
+                        "reused_existing_record": True
+                    })
+                    return {
+                        state_key: existing
+                    }
+
+                client = get_async_client()
+
+                # Exact-match cache probe: repeat sectors skip the model call entirely
+                key = cache_key(agent_type, PROMPT_VERSION, sector_description)
+                result = get_cached_response(key)
+                content = ""
+
+                if result is None:
+                    # Get response from OpenAI responses API
+                    # Static system prefix first, per-sector user message last, so
+                    # back-to-back sectors hit the provider's prompt-prefix cache
+                    async with get_llm_semaphore():
+                        response = await client.responses.create(
+                            model=model_name,
+                            input=[
+                                {"role": "system", "content": system_prompt},
+                                {"role": "user", "content": user_template.format(
+                                    sector_description=sector_description)},
+                            ],
+                            tools=[{"type": "web_search_preview"}],
+                            text=output_format
+                        )
+
+                    # Parse JSON response
+                    content = response.output_text.strip()
+                    result = extract_json(content, tag=agent_type.upper())
+
+                # Validate required keys
+                if not all(k in result for k in required_keys):
+                    raise ValueError(f"Missing required keys in response. Expected: {required_keys}")
+
+                # Populate the cache only for fresh LLM responses
+                if content:
+                    store_cached_response(
+                        key, agent_type, model_name, PROMPT_VERSION, sector_description, result
+                    )
+
+                # Queue for bulk persistence; flushed at the end of the graph run
+                queue_sector_research_record(
+                    business_id=state.get("business_id"),  # Business-specific or sector-only research
+                    sector_key=state["sector_key"],
+                    agent_type=agent_type,
+                    research_run_id=state["research_run_id"],
+                    version=1,
+                    agent_output=result,
+                    model_name=model_name,
+                    prompt_version=PROMPT_VERSION,
+                    sources=result.get("sources"),
+                    confidence_level=None
+                )
+
+                logger.log_success({
+                    "model_name": model_name,
+                    "response_length": len(content),
+                    "keys_validated": len(required_keys)
+                })
+
+                # Return only the field this agent updates
+                return {
+                    state_key: result
+                }
+
+            except Exception as e:
+                if error_defaults is None:
+                    raise
+
+                logger.log_failure(str(e), {
+                    "sector_description": sector_description[:100] + "..." if len(sector_description) > 100 else sector_description
+                })
+
+                # Return only this agent's key; LangGraph merges partial updates,
+                # so spreading the whole state here would just copy it
+                return {
+                    state_key: {
+                        "error": f"{error_message}: {str(e)}",
+                        **error_defaults
+                    }
+                }
+
+    research_node.__name__ = f"{state_key}_node"
+    if doc is not None:
+        research_node.__doc__ = doc
+    return research_node
@@ -0,0 +1,181 @@
+"""
+Offline batch submission for deep research backfills.
+
+Re-processing many sectors does not need interactive latency, so this module
+packs every (sector, agent) pair into one OpenAI Batch API job: batch pricing
+is roughly half the synchronous rate and the 24h completion window lets the
+provider pipeline the work server-side. Results are fed back through the same
+extract_json + queued bulk persistence path the live graph uses.
+"""
+
+import asyncio
+import tempfile
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+import orjson
+
+from deep_research.agents import competition, market_structure, monetization, platform_risk
+from deep_research.agents import exit as exit_agent
+from deep_research.db import flush_sector_research_records, queue_sector_research_record
+from deep_research.graph import run_deep_research_async
+from deep_research.llm_client import get_client
+from deep_research.orchestrator import make_sector_key
+from deep_research.parse_llm_json import extract_json
+
+MODEL_ID = "o4-mini-deep-research"
+PROMPT_VERSION = "v1.0"
+COMPLETION_WINDOW = "24h"
+
+# agent_type -> module providing SYSTEM_PROMPT, USER_TEMPLATE and _OUTPUT_FORMAT
+_AGENT_MODULES = {
+    "market_structure": market_structure,
+    "platform_risk": platform_risk,
+    "monetization": monetization,
+    "competition": competition,
+    "buyer_exit": exit_agent,
+}
+
+
+async def run_deep_research_batch(
+    sector_descriptions: List[str],
+    max_concurrency: int = 8,
+) -> List[dict]:
+    """
+    Run full research graphs for many sectors concurrently.
+
+    Interactive-speed counterpart to the Batch API path above: each sector
+    still pays synchronous pricing, but runs overlap up to max_concurrency
+    so wall time approaches the slowest run instead of the sum. Results are
+    synthesis dicts in input order.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def bounded(sector_description: str) -> dict:
+        async with semaphore:
+            return await run_deep_research_async(sector_description)
+
+    return await asyncio.gather(*(bounded(s) for s in sector_descriptions))
+
+
+def build_batch_requests(sector_descriptions: List[str]) -> List[Dict[str, Any]]:
+    """
+    Build one /v1/responses request line per (sector, agent) pair.
+
+    custom_id encodes the sector index and agent type so results can be
+    matched back without carrying the full description through the API.
+    """
+    requests = []
+    for i, sector_description in enumerate(sector_descriptions):
+        for agent_type, module in _AGENT_MODULES.items():
+            requests.append({
+                "custom_id": f"{i}:{agent_type}",
+                "method": "POST",
+                "url": "/v1/responses",
+                "body": {
+                    "model": MODEL_ID,
+                    "input": [
+                        {"role": "system", "content": module.SYSTEM_PROMPT},
+                        {"role": "user", "content": module.USER_TEMPLATE.format(
+                            sector_description=sector_description
+                        )},
+                    ],
+                    "tools": [{"type": "web_search_preview"}],
+                    "text": module._OUTPUT_FORMAT,
+                },
+            })
+    return requests
+
+
+def submit_batch(sector_descriptions: List[str]) -> str:
+    """Upload the request file and create the batch job; returns the batch id."""
+    client = get_client()
+
+    with tempfile.NamedTemporaryFile(suffix=".jsonl") as f:
+        for request in build_batch_requests(sector_descriptions):
+            f.write(orjson.dumps(request) + b"\n")
+        f.flush()
+        f.seek(0)
+        input_file = client.files.create(file=f, purpose="batch")
+
+    batch = client.batches.create(
+        input_file_id=input_file.id,
+        endpoint="/v1/responses",
+        completion_window=COMPLETION_WINDOW,
+    )
+    return batch.id
+
+
+def wait_for_batch(batch_id: str, poll_interval: float = 60.0):
+    """Poll until the batch reaches a terminal status; returns the batch object."""
+    client = get_client()
+    while True:
+        batch = client.batches.retrieve(batch_id)
+        if batch.status in ("completed", "failed", "expired", "cancelled"):
+            return batch
+        time.sleep(poll_interval)
+
+
+def _output_text(body: Dict[str, Any]) -> str:
+    """Concatenate the output_text content of one responses API result body."""
+    parts = []
+    for item in body.get("output", []):
+        if item.get("type") != "message":
+            continue
+        for piece in item.get("content", []):
+            if piece.get("type") == "output_text":
+                parts.append(piece.get("text", ""))
+    return "".join(parts)
+
+
+def ingest_batch_results(
+    batch_id: str,
+    sector_descriptions: List[str],
+    business_id: Optional[str] = None,
+) -> int:
+    """
+    Persist completed batch results as sector research records.
+
+    sector_descriptions must be the same list (same order) the batch was
+    submitted with. Lines that errored or fail validation are skipped and
+    counted against the return value, which is the number of records stored.
+    """
+    client = get_client()
+    batch = client.batches.retrieve(batch_id)
+    if batch.output_file_id is None:
+        return 0
+
+    research_run_id = str(uuid.uuid4())
+    stored = 0
+
+    output = client.files.content(batch.output_file_id)
+    for line in output.text.splitlines():
+        if not line.strip():
+            continue
+        record = orjson.loads(line)
+
+        response = record.get("response") or {}
+        if response.get("status_code") != 200:
+            continue
+
+        index_str, _, agent_type = record["custom_id"].partition(":")
+        sector_description = sector_descriptions[int(index_str)]
+
+        result = extract_json(_output_text(response["body"]), tag=agent_type.upper())
+        queue_sector_research_record(
+            business_id=business_id,
+            sector_key=make_sector_key(sector_description),
+            agent_type=agent_type,
+            research_run_id=research_run_id,
+            version=1,
+            agent_output=result,
+            model_name=MODEL_ID,
+            prompt_version=PROMPT_VERSION,
+            sources=result.get("sources"),
+            confidence_level=None,
+        )
+        stored += 1
+
+    flush_sector_research_records()
+    return stored
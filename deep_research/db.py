@@ -3,22 +3,105 @@ Database utilities for deep research persistence.
 """
 
 import hashlib
-import json
+import threading
+
+import orjson
 from typing import Optional, Any
 import psycopg2
 import os
-from psycopg2.extras import Json
+import atexit
+from psycopg2.extras import Json, execute_values
+from psycopg2.pool import ThreadedConnectionPool
+
+# Lazily-built connection pool shared by all deep research DB helpers. A
+# research run issues many small statements from several threads; reusing
+# pooled connections avoids a TCP + auth handshake per write.
+_POOL: Optional[ThreadedConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ThreadedConnectionPool:
+    global _POOL
+    if _POOL is None:
+        with _pool_lock:
+            if _POOL is None:
+                _POOL = ThreadedConnectionPool(
+                    minconn=2,
+                    maxconn=16,
+                    host="localhost",
+                    database="acquire_agents",
+                    user="acquire_user",
+                    password="acquire_pass",
+                    port=5432
+                )
+                atexit.register(_POOL.closeall)
+    return _POOL
 
 
 def get_db_connection():
-    """Get a database connection for deep research operations."""
-    return psycopg2.connect(
-        host="localhost",
-        database="acquire_agents",
-        user="acquire_user",
-        password="acquire_pass",
-        port=5432
-    )
+    """Check a database connection out of the shared pool."""
+    return _get_pool().getconn()
+
+
+def put_db_connection(conn) -> None:
+    """Return a connection to the pool; pair with every get_db_connection."""
+    _get_pool().putconn(conn)
+
+
+def sector_research_already_done(
+    sector_key: str,
+    agent_type: str,
+    prompt_version: str
+) -> Optional[dict]:
+    """
+    Return the stored agent_output if this research already exists, else None.
+
+    One indexed lookup lets an agent skip its LLM call entirely when the
+    (sector_key, agent_type, prompt_version) triple was already researched;
+    unlike the llm_cache entry, the record never expires.
+    """
+    conn = None
+    try:
+        conn = get_db_connection()
+        with conn.cursor() as cursor:
+            cursor.execute("""
+                SELECT agent_output FROM sector_research_records
+                WHERE sector_key = %s AND agent_type = %s AND prompt_version = %s
+                ORDER BY version DESC, created_at DESC
+                LIMIT 1
+            """, (sector_key, agent_type, prompt_version))
+            row = cursor.fetchone()
+            return row[0] if row else None
+    finally:
+        if conn:
+            put_db_connection(conn)
+
+
+def find_sector_research_by_hash(
+    sector_key: str,
+    agent_type: str,
+    content_hash: str
+) -> Optional[dict]:
+    """
+    Return the agent_output of the record matching this dedup triple, if any.
+
+    Rides the ux_sector_research_dedup unique index, so the lookup is a
+    single index probe.
+    """
+    conn = None
+    try:
+        conn = get_db_connection()
+        with conn.cursor() as cursor:
+            cursor.execute("""
+                SELECT agent_output FROM sector_research_records
+                WHERE sector_key = %s AND agent_type = %s AND content_hash = %s
+                LIMIT 1
+            """, (sector_key, agent_type, content_hash))
+            row = cursor.fetchone()
+            return row[0] if row else None
+    finally:
+        if conn:
+            put_db_connection(conn)
 
 
 def persist_sector_research_record(
@@ -31,19 +114,25 @@ def persist_sector_research_record(
     model_name: str,
     prompt_version: str,
     sources: Optional[Any] = None,
-    confidence_level: Optional[str] = None
+    confidence_level: Optional[str] = None,
+    content_hash: Optional[str] = None
 ) -> None:
     """
     Persist a sector research record to the database.
 
-    Computes content_hash from sector_key + agent_type + prompt_version + agent_output.
-    Relies on database unique constraint to prevent duplicates.
+    content_hash defaults to a hash of sector_key + agent_type +
+    prompt_version + agent_output; callers that dedupe on something else
+    (synthesis hashes its research inputs) can pass their own.
+    Duplicate records are dropped server-side via ON CONFLICT DO NOTHING.
     """
     # Compute content hash
-    content_to_hash = f"{sector_key}|{agent_type}|{prompt_version}|{json.dumps(agent_output, sort_keys=True)}"
-    content_hash = hashlib.sha256(content_to_hash.encode()).hexdigest()
+    output_bytes = orjson.dumps(agent_output, option=orjson.OPT_SORT_KEYS)
+    if content_hash is None:
+        content_to_hash = f"{sector_key}|{agent_type}|{prompt_version}|".encode() + output_bytes
+        content_hash = hashlib.sha256(content_to_hash).hexdigest()
 
-    # Prepare data
+    # Prepare data; agent_output reuses the bytes hashed above via a ::jsonb
+    # cast instead of a second serialization through the Json adapter
     sources_json = Json(sources) if sources is not None else None
 
     conn = None
@@ -55,26 +144,117 @@ def persist_sector_research_record(
                     business_id, sector_key, agent_type, research_run_id,
                     version, content_hash, agent_output, model_name,
                     prompt_version, sources, confidence_level
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                ) VALUES (%s, %s, %s, %s, %s, %s, %s::jsonb, %s, %s, %s, %s)
+                ON CONFLICT DO NOTHING
             """, (
                 business_id, sector_key, agent_type, research_run_id,
-                version, content_hash, Json(agent_output), model_name,
+                version, content_hash, output_bytes.decode(), model_name,
                 prompt_version, sources_json, confidence_level
             ))
         conn.commit()
 
-    except psycopg2.errors.UniqueViolation:
-        # Duplicate record - swallow the error and continue
+    except Exception as e:
+        # Database errors - fail fast; duplicates are a server-side no-op
         if conn:
             conn.rollback()
-        pass  # Silently ignore duplicate inserts
+        raise e
 
-    except Exception as e:
-        # Other database errors - fail fast
+    finally:
+        if conn:
+            put_db_connection(conn)
+
+
+# Deferred persistence: research agents can queue records instead of paying a
+# connection + INSERT round-trip each, and the pipeline flushes them in one
+# multi-row statement when the graph run completes (or the buffer fills).
+# A last-chance atexit flush bounds the durability window on shutdown.
+_PENDING_FLUSH_THRESHOLD = 25
+_pending_records: list = []
+_pending_lock = threading.Lock()
+
+atexit.register(lambda: flush_sector_research_records())
+
+
+def queue_sector_research_record(
+    business_id: Optional[str],
+    sector_key: str,
+    agent_type: str,
+    research_run_id: str,
+    version: int,
+    agent_output: dict,
+    model_name: str,
+    prompt_version: str,
+    sources: Optional[Any] = None,
+    confidence_level: Optional[str] = None,
+    content_hash: Optional[str] = None
+) -> None:
+    """
+    Buffer a sector research record for bulk insertion.
+
+    Same contract as persist_sector_research_record but defers the write;
+    call flush_sector_research_records at the end of the pipeline run.
+    Flushes automatically if the buffer grows past the threshold.
+    """
+    output_bytes = orjson.dumps(agent_output, option=orjson.OPT_SORT_KEYS)
+    if content_hash is None:
+        content_to_hash = f"{sector_key}|{agent_type}|{prompt_version}|".encode() + output_bytes
+        content_hash = hashlib.sha256(content_to_hash).hexdigest()
+
+    row = (
+        business_id, sector_key, agent_type, research_run_id,
+        version, content_hash, output_bytes.decode(), model_name,
+        prompt_version, Json(sources) if sources is not None else None,
+        confidence_level
+    )
+
+    with _pending_lock:
+        _pending_records.append(row)
+        should_flush = len(_pending_records) >= _PENDING_FLUSH_THRESHOLD
+
+    if should_flush:
+        # Drain on a background thread so no agent blocks on the commit;
+        # each flush swaps the buffer under the lock, so concurrent flushes
+        # write disjoint rows.
+        threading.Thread(
+            target=flush_sector_research_records, daemon=True
+        ).start()
+
+
+def flush_sector_research_records() -> int:
+    """
+    Write all queued sector research records in one multi-row INSERT.
+
+    ON CONFLICT DO NOTHING replaces the per-row UniqueViolation handling for
+    duplicates. Returns the number of rows submitted.
+    """
+    with _pending_lock:
+        rows = list(_pending_records)
+        _pending_records.clear()
+
+    if not rows:
+        return 0
+
+    conn = None
+    try:
+        conn = get_db_connection()
+        with conn.cursor() as cursor:
+            execute_values(cursor, """
+                INSERT INTO sector_research_records (
+                    business_id, sector_key, agent_type, research_run_id,
+                    version, content_hash, agent_output, model_name,
+                    prompt_version, sources, confidence_level
+                ) VALUES %s
+                ON CONFLICT DO NOTHING
+            """, rows,
+                template="(%s, %s, %s, %s, %s, %s, %s::jsonb, %s, %s, %s, %s)")
+        conn.commit()
+        return len(rows)
+
+    except Exception:
         if conn:
             conn.rollback()
-        raise e
+        raise
 
     finally:
         if conn:
-            conn.close()
+            put_db_connection(conn)
@@ -1,4 +1,8 @@
+import asyncio
+from functools import lru_cache
+
 from langgraph.graph import StateGraph, START, END
+from langgraph.constants import Send
 from .state import DeepResearchState
 from .orchestrator import orchestrator_node
 from .agents.market_structure import market_structure_node
@@ -7,10 +11,22 @@ from .agents.monetization import monetization_node
 from .agents.competition import competition_node
 from .agents.exit import exit_node
 from .synthesis import synthesis_node
+from .db import flush_sector_research_records
+
+
+_RESEARCH_AGENTS = [
+    "market_structure", "platform_risk", "monetization", "competition", "exit"
+]
+
+
+def _dispatch_research(state: DeepResearchState):
+    """Fan the orchestrated state out to every research agent at once."""
+    return [Send(agent, state) for agent in _RESEARCH_AGENTS]
 
 
+@lru_cache(maxsize=1)
 def build_deep_research_graph():
-    """Build the deep research LangGraph workflow."""
+    """Build and compile the deep research workflow; compiled once per process."""
 
     # Create the graph
     graph = StateGraph(DeepResearchState)
@@ -28,12 +44,9 @@ def build_deep_research_graph():
     # Start -> orchestrator
     graph.add_edge(START, "orchestrator")
 
-    # Orchestrator -> parallel execution of all research agents
-    graph.add_edge("orchestrator", "market_structure")
-    graph.add_edge("orchestrator", "platform_risk")
-    graph.add_edge("orchestrator", "monetization")
-    graph.add_edge("orchestrator", "competition")
-    graph.add_edge("orchestrator", "exit")
+    # Orchestrator -> parallel execution of all research agents, dispatched
+    # with Send so the fan-out happens in a single superstep
+    graph.add_conditional_edges("orchestrator", _dispatch_research)
 
     # All research agents join at synthesis
     graph.add_edge("market_structure", "synthesis")
@@ -49,7 +62,7 @@ def build_deep_research_graph():
     return graph.compile()
 
 
-def run_deep_research(sector_description: str, business_id: str = None) -> dict:
+async def run_deep_research_async(sector_description: str, business_id: str = None) -> dict:
     """
     Run the deep research workflow for a given sector description.
 
@@ -60,7 +73,7 @@ def run_deep_research(sector_description: str, business_id: str = None) -> dict:
     Returns:
         dict: The synthesis results containing SWOT, risks, opportunities, and verdict
     """
-    # Build the graph
+    # Compiled once and cached; repeat calls skip graph validation/compile
     app = build_deep_research_graph()
 
     # Initialize state (research_run_id and sector_key will be set by orchestrator)
@@ -77,8 +90,18 @@ def run_deep_research(sector_description: str, business_id: str = None) -> dict:
         synthesis=None
     )
 
-    # Run the workflow
-    final_state = app.invoke(initial_state)
+    # Run the workflow; every node is async, so ainvoke overlaps the five
+    # research round trips (total latency ~= max, not sum)
+    try:
+        final_state = await app.ainvoke(initial_state)
+    finally:
+        # Write any agent records queued during the run in one bulk insert
+        flush_sector_research_records()
 
     # Return only the synthesis results
     return final_state.get("synthesis", {})
+
+
+def run_deep_research(sector_description: str, business_id: str = None) -> dict:
+    """Synchronous wrapper around run_deep_research_async."""
+    return asyncio.run(run_deep_research_async(sector_description, business_id))
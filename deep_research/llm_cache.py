@@ -0,0 +1,94 @@
+"""
+Exact-match LLM response cache for deep research agents.
+
+Backed by the shared llm_cache Postgres table. Keys are derived from the
+agent type, prompt version and sector description, so repeat research runs
+on the same sector (dev iteration, re-runs) skip the deep-research model
+call entirely while still persisting a sector research record.
+"""
+
+import hashlib
+from datetime import datetime, timedelta
+from typing import Optional
+
+import orjson
+from psycopg2.extras import Json
+
+from deep_research.db import get_db_connection, put_db_connection
+
+# Entries older than this are treated as misses and deleted lazily on read
+CACHE_TTL = timedelta(days=7)
+
+
+def cache_key(agent_type: str, prompt_version: str, sector_description: str) -> str:
+    """Deterministic cache key for one agent invocation on one sector"""
+    payload = orjson.dumps(
+        {
+            "agent": agent_type,
+            "prompt_version": prompt_version,
+            "sector": sector_description,
+        },
+        option=orjson.OPT_SORT_KEYS,
+    )
+    return hashlib.sha256(payload).hexdigest()
+
+
+def get_cached_response(key: str) -> Optional[dict]:
+    """Return the cached response for key, or None if absent/expired."""
+    conn = None
+    try:
+        conn = get_db_connection()
+        with conn.cursor() as cursor:
+            cursor.execute(
+                "SELECT response, expires_at FROM llm_cache WHERE cache_key = %s",
+                (key,),
+            )
+            row = cursor.fetchone()
+            if row is None:
+                return None
+
+            response, expires_at = row
+            if expires_at is not None and expires_at < datetime.now(expires_at.tzinfo):
+                # Expired - delete lazily and report a miss
+                cursor.execute("DELETE FROM llm_cache WHERE cache_key = %s", (key,))
+                conn.commit()
+                return None
+
+            return response
+    finally:
+        if conn:
+            put_db_connection(conn)
+
+
+def store_cached_response(
+    key: str,
+    agent_type: str,
+    model_name: str,
+    prompt_version: str,
+    sector_description: str,
+    response: dict,
+) -> None:
+    """Upsert one parsed agent response into the cache with the default TTL."""
+    sector_hash = hashlib.sha256(sector_description.encode()).hexdigest()
+    conn = None
+    try:
+        conn = get_db_connection()
+        with conn.cursor() as cursor:
+            cursor.execute(
+                """
+                INSERT INTO llm_cache (
+                    cache_key, stage, prompt_version, model_name,
+                    content_hash, response, expires_at
+                ) VALUES (%s, %s, %s, %s, %s, %s, NOW() + %s)
+                ON CONFLICT (cache_key) DO UPDATE SET
+                    response = EXCLUDED.response,
+                    created_at = NOW(),
+                    expires_at = EXCLUDED.expires_at
+                """,
+                (key, agent_type, prompt_version, model_name,
+                 sector_hash, Json(response), CACHE_TTL),
+            )
+        conn.commit()
+    finally:
+        if conn:
+            put_db_connection(conn)
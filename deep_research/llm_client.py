@@ -0,0 +1,51 @@
+"""
+Shared OpenAI clients for the deep research pipeline.
+
+Constructing a client builds a fresh httpx pool and TLS context, so every
+module reuses these process-wide singletons instead of making its own.
+"""
+
+import asyncio
+from functools import lru_cache
+import os
+import weakref
+
+from dotenv import load_dotenv
+from openai import AsyncOpenAI, OpenAI
+
+# Load environment variables
+load_dotenv()
+
+
+@lru_cache(maxsize=1)
+def get_async_client() -> AsyncOpenAI:
+    """One async client per process; the agent nodes share its connection pool"""
+    return AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+
+@lru_cache(maxsize=1)
+def get_client() -> OpenAI:
+    """Sync counterpart for the non-async call sites (synthesis)"""
+    return OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+
+# Cap on in-flight LLM calls. The async fan-out plus batch runners can
+# burst past the provider's per-minute limits, turning parallelism into
+# exponential-backoff retries; every responses.create awaits this first.
+_LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+
+# One semaphore per event loop: each deep-research job runs under its own
+# asyncio.run() in its own thread, and an asyncio.Semaphore binds to the
+# first loop that waits on it - a single module-level instance raises
+# "bound to a different event loop" from every other running job. Weak keys
+# let finished loops drop their entry instead of accumulating.
+_loop_semaphores: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def get_llm_semaphore() -> asyncio.Semaphore:
+    """The current loop's cap on concurrent LLM calls, created on first use"""
+    loop = asyncio.get_running_loop()
+    semaphore = _loop_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _loop_semaphores[loop] = asyncio.Semaphore(_LLM_MAX_CONCURRENCY)
+    return semaphore
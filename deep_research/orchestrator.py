@@ -1,9 +1,27 @@
+import hashlib
+import re
+import unicodedata
 import uuid
 from typing import Any, Dict
 from deep_research.state import DeepResearchState
 from utils import log_agent_execution
 
 
+def make_sector_key(sector_description: str) -> str:
+    """
+    Canonical, collision-resistant key for a sector description.
+
+    Normalizes unicode to ASCII, lowercases, and joins alphanumeric tokens
+    so phrasing differences (punctuation, spacing, accents) map to the same
+    key; a short hash suffix of the normalized text keeps two sectors that
+    share a long prefix from colliding after truncation.
+    """
+    norm = unicodedata.normalize("NFKD", sector_description).encode("ascii", "ignore").decode().lower()
+    joined = "_".join(re.findall(r"[a-z0-9]+", norm))
+    suffix = hashlib.sha1(joined.encode()).hexdigest()[:8]
+    return f"{joined[:80]}_{suffix}"
+
+
 def orchestrator_node(state: DeepResearchState) -> Dict[str, Any]:
     """
     Orchestrator node that defines the research tasks to be executed.
@@ -30,8 +48,8 @@ def orchestrator_node(state: DeepResearchState) -> Dict[str, Any]:
 
         # Generate persistence metadata
         research_run_id = str(uuid.uuid4())
-        # Create a canonical sector key from the description (simplified for now)
-        sector_key = state["sector_description"].lower().replace(" ", "_")[:100]
+        # Create a canonical sector key from the description
+        sector_key = make_sector_key(state["sector_description"])
 
         # The 5 research tasks are conceptually defined here but not executed
         # They will be handled by separate agent nodes in the graph
@@ -0,0 +1,84 @@
+"""
+Shared JSON extraction for deep research agent responses.
+
+Every research agent asks the model for a bare JSON object; this is the one
+place that trims surrounding text and repairs the malformations the model
+occasionally produces, so parsing fixes land once instead of per-agent.
+"""
+
+import logging
+
+import orjson
+
+log = logging.getLogger(__name__)
+
+
+def _balanced_object(content: str) -> str:
+    """
+    Return the substring spanning the first balanced top-level {...}.
+
+    Single escape-aware scan: braces inside string literals are ignored.
+    If the object never closes (truncated stream), returns everything from
+    the opening brace so the caller's parse failure is informative.
+    """
+    start = content.find('{')
+    if start == -1:
+        return content
+
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(content)):
+        ch = content[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == '\\':
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == '{':
+            depth += 1
+        elif ch == '}':
+            depth -= 1
+            if depth == 0:
+                return content[start:i + 1]
+    return content[start:]
+
+
+def extract_json(content: str, tag: str) -> dict:
+    """
+    Extract and parse the JSON object embedded in an LLM response.
+
+    Trims any text surrounding the outermost {...}, parses strictly, then
+    falls back to two repair passes for invalid escape sequences. Raises
+    ValueError when every pass fails. ``tag`` labels log lines with the
+    calling agent.
+    """
+    content = content.strip()
+
+    if content.endswith('}'):
+        # Complete object with at most a text prefix: slice from the first
+        # brace without a full scan
+        start_idx = content.find('{')
+        json_str = content[start_idx:] if start_idx != -1 else content
+    else:
+        # Truncated output or trailing prose: one balanced-brace scan finds
+        # the parseable object instead of letting orjson rescan and fail
+        json_str = _balanced_object(content)
+
+    try:
+        return orjson.loads(json_str)
+    except orjson.JSONDecodeError as e:
+        log.warning("[%s] JSON parse fallback: %s", tag, e)
+        # Invalid escape sequences are the usual culprit: first strip them,
+        # then try escaping stray backslashes outright.
+        try:
+            return orjson.loads(json_str.encode().decode('unicode_escape'))
+        except Exception:
+            try:
+                return orjson.loads(json_str.replace('\\', '\\\\'))
+            except Exception:
+                raise ValueError(f"Failed to parse JSON response from LLM: {e}")
@@ -1,9 +1,21 @@
 from typing import Optional, TypedDict, Any, Annotated
 
 
-def _update_dict(old: Optional[dict[str, Any]], new: Optional[dict[str, Any]]) -> Optional[dict[str, Any]]:
-    """Reducer that returns new value if present, otherwise old value."""
-    return new if new is not None else old
+def _merge_dict(old: Optional[dict[str, Any]], new: Optional[dict[str, Any]]) -> Optional[dict[str, Any]]:
+    """
+    Reducer that shallow-merges updates into the existing dict.
+
+    With a single writer per key this behaves like replace; once several
+    nodes contribute to the same dict, each can send just its own keys
+    instead of read-modify-writing the whole payload.
+    """
+    if new is None:
+        return old
+    if old is None:
+        return new
+    merged = old.copy()
+    merged.update(new)
+    return merged
 
 
 def _keep_value(old: str, new: Optional[str]) -> str:
@@ -24,11 +36,11 @@ class DeepResearchState(TypedDict):
 
     # Agent outputs - all optional and JSON-serializable
     # Use Annotated to allow concurrent updates from parallel nodes
-    market_structure: Annotated[Optional[dict[str, Any]], _update_dict]
-    platform_risk: Annotated[Optional[dict[str, Any]], _update_dict]
-    monetization: Annotated[Optional[dict[str, Any]], _update_dict]
-    competition: Annotated[Optional[dict[str, Any]], _update_dict]
-    exit: Annotated[Optional[dict[str, Any]], _update_dict]
+    market_structure: Annotated[Optional[dict[str, Any]], _merge_dict]
+    platform_risk: Annotated[Optional[dict[str, Any]], _merge_dict]
+    monetization: Annotated[Optional[dict[str, Any]], _merge_dict]
+    competition: Annotated[Optional[dict[str, Any]], _merge_dict]
+    exit: Annotated[Optional[dict[str, Any]], _merge_dict]
 
     # Final synthesis
-    synthesis: Annotated[Optional[dict[str, Any]], _update_dict]
+    synthesis: Annotated[Optional[dict[str, Any]], _merge_dict]
@@ -1,17 +1,144 @@
-import json
+import hashlib
 from typing import Any, Dict
-import os
-from dotenv import load_dotenv
-from openai import OpenAI
+
+import orjson
+from deep_research.llm_client import get_async_client, get_llm_semaphore
+from deep_research.parse_llm_json import extract_json
 from deep_research.state import DeepResearchState
-from deep_research.db import persist_sector_research_record
+from deep_research.db import find_sector_research_by_hash, queue_sector_research_record
+from deep_research.llm_cache import cache_key, get_cached_response, store_cached_response
 from utils import log_agent_execution
 
-# Load environment variables
-load_dotenv()
 
 
-def synthesis_node(state: DeepResearchState) -> Dict[str, Any]:
+
+# Synthesis-relevant keys per research payload. Sources are URL lists the
+# reasoning step never uses, and error placeholders carry no signal; dropping
+# them cuts prompt tokens roughly in half on typical payloads.
+def _dumps(payload: dict) -> str:
+    """Compact JSON for prompt embedding; orjson emits no whitespace."""
+    return orjson.dumps(payload).decode()
+
+
+SYNTHESIS_PROJECTIONS = {
+    "market_structure": [
+        "market_trend", "demand_drivers", "headwinds",
+        "tailwinds", "small_operator_viability"
+    ],
+    "platform_risk": [
+        "platform_dependencies", "historical_policy_changes",
+        "failure_modes", "risk_level"
+    ],
+    "monetization": [
+        "dominant_models", "high_performing_strategies",
+        "common_monetization_gaps", "revenue_ceiling_constraints"
+    ],
+    "competition": [
+        "dominant_players", "independent_success_cases",
+        "winner_differentiation", "competition_intensity"
+    ],
+    "exit": [
+        "buyer_types", "typical_multiples",
+        "value_creation_triggers", "successful_exit_narratives"
+    ],
+}
+
+
+# Static instruction prefix, passed via the instructions param; kept
+# byte-identical across calls so the provider prompt cache hits on it
+SYSTEM_PROMPT = """You are a synthesis and reasoning agent.
+
+Your role:
+- Reason over completed research outputs
+- Identify cross-cutting patterns and second-order risks
+- Produce a concise SWOT analysis
+- Assess sector suitability for a high-risk, short-horizon buyer
+
+Rules:
+- Do NOT introduce new facts
+- Do NOT repeat research verbatim
+- Only reason over provided inputs
+- Be decisive and concise
+- Respond ONLY in valid JSON matching the required schema"""
+
+# Synthesis prompt: all static tasks and the output spec lead, the five
+# variable research payloads trail, so the shared prefix stays cacheable
+PROMPT_TEMPLATE = """Synthesize the research outputs below into a comprehensive sector analysis.
+
+Perform the following synthesis tasks:
+
+1. Generate a SWOT analysis by reasoning over all research areas
+2. Identify non-obvious risks that emerge from combining multiple research areas
+3. Identify time-sensitive opportunities that require immediate action
+4. Produce a sector_fit_verdict assessing overall attractiveness for a high-risk, short-horizon buyer
+
+Output ONLY valid JSON with exactly this structure:
+{{
+  "swot": {{
+    "strengths": ["list of key strengths"],
+    "weaknesses": ["list of key weaknesses"],
+    "opportunities": ["list of key opportunities"],
+    "threats": ["list of key threats"]
+  }},
+  "non_obvious_risks": ["list of risks that emerge from combining research areas"],
+  "time_sensitive_opportunities": ["list of opportunities requiring immediate action"],
+  "sector_fit_verdict": "High/Medium/Low attractiveness assessment",
+  "justification": "1-2 sentence justification for the verdict"
+}}
+
+Do not repeat individual research findings. Do not introduce new facts. Focus on synthesis and reasoning across all research areas.
+
+---RESEARCH---
+
+MARKET STRUCTURE:
+{market_structure}
+
+PLATFORM RISK:
+{platform_risk}
+
+MONETIZATION:
+{monetization}
+
+COMPETITION:
+{competition}
+
+EXIT ANALYSIS:
+{exit}"""
+
+
+# Structured-output spec for the responses API: the model is constrained to
+# emit exactly this object, so the parser's repair passes never run.
+_OUTPUT_FORMAT = {
+    "format": {
+        "type": "json_schema",
+        "name": "sector_synthesis",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "swot": {
+                    "type": "object",
+                    "properties": {
+                        "strengths": {"type": "array", "items": {"type": "string"}},
+                        "weaknesses": {"type": "array", "items": {"type": "string"}},
+                        "opportunities": {"type": "array", "items": {"type": "string"}},
+                        "threats": {"type": "array", "items": {"type": "string"}},
+                    },
+                    "required": ["strengths", "weaknesses", "opportunities", "threats"],
+                    "additionalProperties": False,
+                },
+                "non_obvious_risks": {"type": "array", "items": {"type": "string"}},
+                "time_sensitive_opportunities": {"type": "array", "items": {"type": "string"}},
+                "sector_fit_verdict": {"type": "string"},
+                "justification": {"type": "string"},
+            },
+            "required": ["swot", "non_obvious_risks", "time_sensitive_opportunities", "sector_fit_verdict", "justification"],
+            "additionalProperties": False,
+        },
+    }
+}
+
+async def synthesis_node(state: DeepResearchState) -> Dict[str, Any]:
     """
     Synthesis node that reasons over completed research.
 
@@ -39,6 +166,26 @@ def synthesis_node(state: DeepResearchState) -> Dict[str, Any]:
         raise ValueError(f"Synthesis cannot proceed: missing research data for {missing_research}. "
                         f"All research agents must complete successfully before synthesis can run.")
 
+    # Agents that failed return an error placeholder; synthesizing over those
+    # would spend a full LLM round trip producing garbage, so short-circuit
+    # with an explicit insufficient-data verdict instead
+    degraded = [name for name, data in required_research.items() if "error" in data]
+    if degraded:
+        return {
+            "synthesis": {
+                "swot": {
+                    "strengths": [],
+                    "weaknesses": [],
+                    "opportunities": [],
+                    "threats": []
+                },
+                "non_obvious_risks": [],
+                "time_sensitive_opportunities": [],
+                "sector_fit_verdict": "Insufficient data",
+                "justification": f"Research failed for: {', '.join(degraded)}. Synthesis skipped."
+            }
+        }
+
     with log_agent_execution(
         agent_name="synthesis",
         business_id=state.get("business_id"),
@@ -55,121 +202,89 @@ def synthesis_node(state: DeepResearchState) -> Dict[str, Any]:
             "validation_passed": True
         }
     ) as logger:
-        # Initialize OpenAI client
-        client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-
-        # Create synthesis prompt
-        prompt = f"""You are a synthesis and reasoning agent.
-
-Your role:
-- Reason over completed research outputs
-- Identify cross-cutting patterns and second-order risks
-- Produce a concise SWOT analysis
-- Assess sector suitability for a high-risk, short-horizon buyer
-
-Rules:
-- Do NOT introduce new facts
-- Do NOT repeat research verbatim
-- Only reason over provided inputs
-- Be decisive and concise
-- Respond ONLY in valid JSON matching the required schema
-
-Synthesize the following research outputs into a comprehensive sector analysis:
-
-MARKET STRUCTURE:
-{json.dumps(market_structure)}
-
-PLATFORM RISK:
-{json.dumps(platform_risk)}
-
-MONETIZATION:
-{json.dumps(monetization)}
-
-COMPETITION:
-{json.dumps(competition)}
-
-EXIT ANALYSIS:
-{json.dumps(exit_data)}
-
-Based on these research findings, perform the following synthesis tasks:
+        # Identical research inputs yield an identical synthesis, so memoize
+        # on a hash of the five payloads; hits short-circuit across runs and
+        # businesses via the persisted record, which never expires
+        input_hash = hashlib.sha256(
+            orjson.dumps(required_research, option=orjson.OPT_SORT_KEYS)
+        ).hexdigest()
+        existing = find_sector_research_by_hash(
+            state["sector_key"], "synthesis", input_hash
+        )
+        if existing is not None:
+            logger.log_success({
+                "model_name": "gpt-5-mini",
+                "response_length": 0,
+                "reused_existing_record": True
+            })
+            return {
+                "synthesis": existing
+            }
 
-1. Generate a SWOT analysis by reasoning over all research areas
-2. Identify non-obvious risks that emerge from combining multiple research areas
-3. Identify time-sensitive opportunities that require immediate action
-4. Produce a sector_fit_verdict assessing overall attractiveness for a high-risk, short-horizon buyer
+        # Shared async OpenAI client (one httpx pool per process)
+        client = get_async_client()
 
-Output ONLY valid JSON with exactly this structure:
-{{
-  "swot": {{
-    "strengths": ["list of key strengths"],
-    "weaknesses": ["list of key weaknesses"],
-    "opportunities": ["list of key opportunities"],
-    "threats": ["list of key threats"]
-  }},
-  "non_obvious_risks": ["list of risks that emerge from combining research areas"],
-  "time_sensitive_opportunities": ["list of opportunities requiring immediate action"],
-  "sector_fit_verdict": "High/Medium/Low attractiveness assessment",
-  "justification": "1-2 sentence justification for the verdict"
-}}
-
-Do not repeat individual research findings. Do not introduce new facts. Focus on synthesis and reasoning across all research areas."""
+        # Project each payload down to its synthesis-relevant keys before
+        # embedding; compact separators drop the whitespace tokens too
+        filtered = {
+            name: {k: data[k] for k in SYNTHESIS_PROJECTIONS[name] if k in data}
+            for name, data in required_research.items()
+        }
 
-        # Get response from OpenAI responses API
-        response = client.responses.create(
-            model="gpt-5-mini",
-            input=prompt,
-            tools=[{"type": "web_search_preview"}]
+        # Create synthesis prompt
+        prompt = PROMPT_TEMPLATE.format(
+            market_structure=_dumps(filtered["market_structure"]),
+            platform_risk=_dumps(filtered["platform_risk"]),
+            monetization=_dumps(filtered["monetization"]),
+            competition=_dumps(filtered["competition"]),
+            exit=_dumps(filtered["exit"]),
         )
 
-        # Parse JSON response
-        content = response.output_text.strip()
+        # Exact-match cache probe keyed on the full prompt, which embeds all
+        # research inputs; dev re-runs over identical research skip the call
+        key = cache_key("synthesis", "v1.0", prompt)
+        cached = get_cached_response(key)
+        content = ""
 
-        # Find JSON object (in case there's any extra text)
-        start_idx = content.find('{')
-        end_idx = content.rfind('}') + 1
-        if start_idx != -1 and end_idx != -1:
-            json_str = content[start_idx:end_idx]
+        if cached is not None:
+            result = cached
         else:
-            json_str = content
-
-        # Try to parse JSON, with fallback for malformed responses
-        try:
-            result = json.loads(json_str)
-        except json.JSONDecodeError as e:
-            # If JSON parsing fails, try to fix common issues
-            print(f"[SYNTHESIS] JSON parsing failed: {e}")
-            print(f"[SYNTHESIS] Raw content: {content[:500]}...")
-
-            # Try to fix escape sequences by using raw string
-            try:
-                # Remove invalid escape sequences by treating as raw string
-                fixed_json = json_str.encode().decode('unicode_escape')
-                result = json.loads(fixed_json)
-                print(f"[SYNTHESIS] Fixed JSON parsing with unicode_escape")
-            except Exception:
-                # If that fails, try a more aggressive approach
-                try:
-                    # Replace problematic backslashes
-                    fixed_json = json_str.replace('\\', '\\\\')
-                    result = json.loads(fixed_json)
-                    print(f"[SYNTHESIS] Fixed JSON parsing by escaping backslashes")
-                except Exception as e2:
-                    print(f"[SYNTHESIS] All JSON parsing attempts failed: {e2}")
-                    raise ValueError(f"Failed to parse JSON response from LLM: {e}")
-
-        # Validate required keys
+            # Get response from OpenAI responses API
+            async with get_llm_semaphore():
+                response = await client.responses.create(
+                    model="gpt-5-mini",
+                    instructions=SYSTEM_PROMPT,
+                    input=prompt,
+                    tools=[{"type": "web_search_preview"}],
+                    text=_OUTPUT_FORMAT
+                )
+
+            # Parse JSON response
+            content = response.output_text.strip()
+            result = extract_json(content, tag="SYNTHESIS")
+
+        # Validate required keys; set difference names exactly what is absent
         required_keys = {"swot", "non_obvious_risks", "time_sensitive_opportunities", "sector_fit_verdict", "justification"}
-        if not all(key in result for key in required_keys):
-            raise ValueError(f"Missing required keys in response. Expected: {required_keys}")
+        missing_keys = required_keys - result.keys()
+        if missing_keys:
+            raise ValueError(f"Missing required keys in response: {sorted(missing_keys)}")
 
         # Validate SWOT structure
         swot = result.get("swot", {})
         swot_keys = {"strengths", "weaknesses", "opportunities", "threats"}
-        if not all(key in swot for key in swot_keys):
-            raise ValueError(f"SWOT missing required keys. Expected: {swot_keys}")
+        missing_swot = swot_keys - swot.keys()
+        if missing_swot:
+            raise ValueError(f"SWOT missing required keys: {sorted(missing_swot)}")
+
+        # Populate the cache only for fresh LLM responses
+        if content:
+            store_cached_response(
+                key, "synthesis", "gpt-5-mini", "v1.0", prompt, result
+            )
 
-        # Persist to database
-        persist_sector_research_record(
+        # Queue for bulk persistence; lands in the same single-commit flush
+        # as the five agent records when the graph run completes
+        queue_sector_research_record(
             business_id=state.get("business_id"),  # Business-specific or sector-only research
             sector_key=state["sector_key"],
             agent_type="synthesis",
@@ -179,7 +294,8 @@ Do not repeat individual research findings. Do not introduce new facts. Focus on
             model_name="o4-mini-deep-research",  # Synthesis uses o4-mini-deep-research
             prompt_version="v1.0",
             sources=None,  # Synthesis doesn't have sources field
-            confidence_level=None
+            confidence_level=None,
+            content_hash=input_hash  # Dedupe on research inputs, not output
         )
 
     logger.log_success({
@@ -6,10 +6,11 @@ Run this to create all tables and optionally add some sample data
 
 from database import create_db_and_tables, get_session_sync
 from models import (
-    RawListing, CanonicalBusinessRecord, ScoringRecord,
+    RawBlob, RawListing, CanonicalBusinessRecord, ScoringRecord,
     FollowUpQuestion, AgentExecutionLog
 )
 from datetime import datetime
+from hashlib import sha256
 from uuid import uuid4
 
 def init_database():
@@ -23,14 +24,18 @@ def add_sample_data():
     session = get_session_sync()
 
     try:
-        # Create sample raw listing
+        # Create sample raw listing; the HTML blob is stored content-addressed
+        # so repeated boilerplate across listings is written only once
         business_id = uuid4()
+        raw_html = "<html><body><h1>Sample SaaS Business</h1><p>Asking Price: $500,000</p></body></html>"
+        raw_html_hash = sha256(raw_html.encode()).hexdigest()
+        session.merge(RawBlob(content_sha256=raw_html_hash, content=raw_html))
         raw_listing = RawListing(
             business_id=business_id,
             marketplace="acquire.com",
             listing_url="https://acquire.com/business/sample-saas-001",
             scrape_timestamp=datetime.utcnow(),
-            raw_html="<html><body><h1>Sample SaaS Business</h1><p>Asking Price: $500,000</p></body></html>",
+            raw_html_sha256=raw_html_hash,
             raw_text="Sample SaaS Business - Asking Price: $500,000 - Monthly Revenue: $50,000",
             listing_category="SaaS",
             seller_country="United States",
@@ -2,7 +2,23 @@ from sqlmodel import SQLModel, Field, Relationship
 from typing import Optional, List
 from datetime import datetime
 from uuid import uuid4
-from sqlalchemy import Column, JSON, Index
+from sqlalchemy import Column, Index, UniqueConstraint, text
+from sqlalchemy.dialects.postgresql import JSONB
+
+
+class RawBlob(SQLModel, table=True):
+    """
+    Content-addressed storage for large scraped blobs.
+
+    Listings sharing boilerplate HTML store the content once here and point
+    at it by hash, instead of repeating multi-KB blobs per scrape. No foreign
+    key back to listings, matching the ingestion-side design below.
+    """
+    __tablename__ = "raw_blobs"
+
+    content_sha256: str = Field(primary_key=True, description="SHA-256 hex digest of content")
+    content: str = Field(description="The raw blob content")
+    created_at: datetime = Field(default_factory=datetime.utcnow)
 
 
 class RawListing(SQLModel, table=True):
@@ -18,11 +34,12 @@ class RawListing(SQLModel, table=True):
     __tablename__ = "raw_listings"
 
     id: str = Field(default_factory=lambda: str(uuid4()), primary_key=True)
-    business_id: str = Field(index=True, description="Stable UUID per unique business listing")
+    business_id: str = Field(description="Stable UUID per unique business listing")
     marketplace: str = Field(index=True, description="e.g., 'acquire.com', 'flippa'")
-    listing_url: str = Field(description="Full URL of the scraped listing")
-    scrape_timestamp: datetime = Field(default_factory=datetime.utcnow, index=True)
+    listing_url: str = Field(index=True, description="Full URL of the scraped listing")
+    scrape_timestamp: datetime = Field(default_factory=datetime.utcnow)
     raw_html: Optional[str] = Field(description="Full raw HTML content")
+    raw_html_sha256: Optional[str] = Field(default=None, index=True, description="Content hash into raw_blobs; set instead of raw_html for deduplicated storage")
     raw_text: Optional[str] = Field(description="Extracted plaintext content")
     listing_category: Optional[str] = Field(description="Raw category from marketplace")
     seller_country: Optional[str] = Field(description="Raw country/location data")
@@ -31,9 +48,22 @@ class RawListing(SQLModel, table=True):
     profit_raw: Optional[str] = Field(description="Raw profit string")
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
-    # Composite index for finding latest scrape per business
+    # Covering index for latest-scrape-per-business: DESC matches the
+    # ORDER BY ... LIMIT 1 shape, and INCLUDE lets queries that only read
+    # the url/marketplace answer from the index without a heap fetch
     __table_args__ = (
-        Index('ix_raw_listings_business_scrape', 'business_id', 'scrape_timestamp'),
+        # Backs the scraper's ON CONFLICT (business_id, listing_url) DO
+        # NOTHING dedup path; without it the conflict target has no arbiter
+        UniqueConstraint('business_id', 'listing_url',
+                         name='uq_raw_listings_business_url'),
+        Index('ix_raw_listings_business_scrape', 'business_id',
+              text('scrape_timestamp DESC'),
+              postgresql_include=['listing_url', 'marketplace']),
+        # Timestamps grow monotonically on this append-only table; BRIN
+        # serves time-range scans at a fraction of a btree's size and
+        # insert maintenance cost
+        Index('ix_raw_listings_scrape_ts_brin', 'scrape_timestamp',
+              postgresql_using='brin', postgresql_with={'pages_per_range': 32}),
     )
 
 
@@ -50,80 +80,110 @@ class CanonicalBusinessRecord(SQLModel, table=True):
     __tablename__ = "canonical_business_records"
 
     id: str = Field(default_factory=lambda: str(uuid4()), primary_key=True)
-    business_id: str = Field(index=True, description="References business_id in raw_listings")
+    business_id: str = Field(description="References business_id in raw_listings")
     version: int = Field(default=1, description="Incrementing version for append-only updates")
     agent_run_id: str = Field(description="ID of the agent run that produced this record")
-    content_hash: str = Field(description="SHA-256 hash of input content for versioning")
+    content_hash: str = Field(description="BLAKE2b hash of input content for versioning")
 
     # Financials domain
     financials: Optional[dict] = Field(
         default=None,
-        sa_column=Column(JSON),
+        sa_column=Column(JSONB),
         description="Financial metrics: asking_price_usd, monthly_revenue_usd, etc."
     )
 
     # Product domain
     product: Optional[dict] = Field(
         default=None,
-        sa_column=Column(JSON),
+        sa_column=Column(JSONB),
         description="Product details: type, vertical, features array, etc."
     )
 
     # Customers domain
     customers: Optional[dict] = Field(
         default=None,
-        sa_column=Column(JSON),
+        sa_column=Column(JSONB),
         description="Customer metrics: count, type, churn, concentration risk"
     )
 
     # Operations domain
     operations: Optional[dict] = Field(
         default=None,
-        sa_column=Column(JSON),
+        sa_column=Column(JSONB),
         description="Operational details: owner hours, dependencies, key person risk"
     )
 
     # Technology domain
     technology: Optional[dict] = Field(
         default=None,
-        sa_column=Column(JSON),
+        sa_column=Column(JSONB),
         description="Tech stack, hosting, code ownership, API dependencies"
     )
 
     # Growth domain
     growth: Optional[dict] = Field(
         default=None,
-        sa_column=Column(JSON),
+        sa_column=Column(JSONB),
         description="Growth metrics: channels, trends, marketing spend"
     )
 
     # Risks domain
     risks: Optional[dict] = Field(
         default=None,
-        sa_column=Column(JSON),
+        sa_column=Column(JSONB),
         description="Risk assessment: platform dependency, regulatory, IP"
     )
 
     # Seller domain
     seller: Optional[dict] = Field(
         default=None,
-        sa_column=Column(JSON),
+        sa_column=Column(JSONB),
         description="Seller details: location, selling reason, post-sale involvement"
     )
 
     # Confidence and uncertainty flags
     confidence_flags: Optional[dict] = Field(
         default=None,
-        sa_column=Column(JSON),
+        sa_column=Column(JSONB),
         description="Uncertainty indicators: missing data, assumptions, follow-up needs"
     )
 
+    # Hot scalars denormalized out of the JSONB domains above so filter
+    # queries compare typed columns instead of casting per row; the JSONB
+    # keeps the full structure and stays authoritative
+    asking_price_usd: Optional[float] = Field(default=None, description="Denormalized from financials")
+    monthly_revenue_usd: Optional[float] = Field(default=None, description="Denormalized from financials")
+    monthly_profit_usd: Optional[float] = Field(default=None, description="Denormalized from financials")
+    business_vertical: Optional[str] = Field(default=None, description="Denormalized from product.vertical")
+    customer_count: Optional[int] = Field(default=None, description="Denormalized from customers.total_customers")
+
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
     # Indexes for common queries
     __table_args__ = (
         Index('ix_canonical_business_version', 'business_id', 'version'),
-        Index('ix_canonical_business_created', 'created_at'),
+        # Serves the latest-record-per-business LIMIT 1 lookups without a sort
+        Index('ix_canonical_business_id_created_at', 'business_id', 'created_at'),
+        # Backs the single-statement upsert in insert_canonical_record
+        Index('ux_canonical_business_contenthash', 'business_id', 'content_hash', unique=True),
+        # Containment/path filters on the hot JSONB domains; jsonb_path_ops
+        # keeps the GIN entries small (supports @> but not key-existence)
+        Index('ix_canonical_financials_gin', 'financials',
+              postgresql_using='gin', postgresql_ops={'financials': 'jsonb_path_ops'}),
+        Index('ix_canonical_product_gin', 'product',
+              postgresql_using='gin', postgresql_ops={'product': 'jsonb_path_ops'}),
+        Index('ix_canonical_risks_gin', 'risks',
+              postgresql_using='gin', postgresql_ops={'risks': 'jsonb_path_ops'}),
+        # Range filters/sorts on asking price extract the key per row
+        # without an index; a functional btree serves them directly
+        Index('ix_canonical_asking_price',
+              text("((financials->>'asking_price_usd')::numeric)")),
+        # Screening filters on the denormalized scalars
+        Index('ix_canonical_vertical_price_revenue',
+              'business_vertical', 'asking_price_usd', 'monthly_revenue_usd'),
+        # BRIN for time-range scans over the append-only history
+        Index('ix_canonical_created_brin', 'created_at',
+              postgresql_using='brin', postgresql_with={'pages_per_range': 32}),
     )
 
 
@@ -140,7 +200,7 @@ class ScoringRecord(SQLModel, table=True):
     __tablename__ = "scoring_records"
 
     id: str = Field(default_factory=lambda: str(uuid4()), primary_key=True)
-    business_id: str = Field(index=True, description="References business_id in raw_listings")
+    business_id: str = Field(description="References business_id in raw_listings")
     canonical_record_id: str = Field(index=True, description="References id in canonical_business_records")
     scoring_run_id: str = Field(description="ID of the scoring run/agent execution")
 
@@ -160,12 +220,12 @@ class ScoringRecord(SQLModel, table=True):
     # Top factors (arrays for flexible content)
     top_buy_reasons: Optional[List[str]] = Field(
         default=None,
-        sa_column=Column(JSON),
+        sa_column=Column(JSONB),
         description="Array of top reasons to pursue acquisition"
     )
     top_risks: Optional[List[str]] = Field(
         default=None,
-        sa_column=Column(JSON),
+        sa_column=Column(JSONB),
         description="Array of top risks identified"
     )
 
@@ -177,6 +237,9 @@ class ScoringRecord(SQLModel, table=True):
         Index('ix_scoring_total_score', 'total_score'),
         Index('ix_scoring_tier_timestamp', 'tier', 'scoring_timestamp'),
         Index('ix_scoring_business_timestamp', 'business_id', 'scoring_timestamp'),
+        # Leaderboard shape: top-N by score within a tier, served as a
+        # backwards index scan instead of filter + top-N heapsort
+        Index('ix_scoring_tier_total_desc', 'tier', text('total_score DESC')),
     )
 
 
@@ -193,7 +256,7 @@ class FollowUpQuestion(SQLModel, table=True):
     __tablename__ = "follow_up_questions"
 
     id: str = Field(default_factory=lambda: str(uuid4()), primary_key=True)
-    business_id: str = Field(index=True, description="References business_id in raw_listings")
+    business_id: str = Field(description="References business_id in raw_listings")
     canonical_record_id: str = Field(index=True, description="References id in canonical_business_records")
 
     question_text: str = Field(description="Generated question for seller")
@@ -230,13 +293,13 @@ class AgentExecutionLog(SQLModel, table=True):
     __tablename__ = "agent_execution_logs"
 
     id: str = Field(default_factory=lambda: str(uuid4()), primary_key=True)
-    agent_name: str = Field(index=True, description="Name of agent: 'categorization', 'scoring', etc.")
-    business_id: Optional[str] = Field(default=None, index=True, description="References business_id in raw_listings (null for sector-level research)")
+    agent_name: str = Field(description="Name of agent: 'categorization', 'scoring', etc.")
+    business_id: Optional[str] = Field(default=None, description="References business_id in raw_listings (null for sector-level research)")
 
     execution_id: str = Field(description="Unique ID for this agent execution")
     input_snapshot: Optional[dict] = Field(
         default=None,
-        sa_column=Column(JSON),
+        sa_column=Column(JSONB),
         description="Snapshot of input data used by agent"
     )
 
@@ -244,7 +307,7 @@ class AgentExecutionLog(SQLModel, table=True):
     error_message: Optional[str] = Field(description="Error details if failed")
     execution_metadata: Optional[dict] = Field(
         default=None,
-        sa_column=Column(JSON),
+        sa_column=Column(JSONB),
         description="Additional execution details: duration, token usage, etc."
     )
 
@@ -255,9 +318,39 @@ class AgentExecutionLog(SQLModel, table=True):
     __table_args__ = (
         Index('ix_agent_exec_business_status', 'business_id', 'status'),
         Index('ix_agent_exec_name_started', 'agent_name', 'started_at'),
+        # BRIN for time-range scans over the append-only log
+        Index('ix_agent_exec_started_brin', 'started_at',
+              postgresql_using='brin', postgresql_with={'pages_per_range': 32}),
     )
 
 
+class LLMCache(SQLModel, table=True):
+    """
+    Content-addressable cache of LLM responses.
+
+    Design choices:
+    - Keyed by hash of (stage, prompt_version, model, content_hash) so any
+      prompt or model change naturally invalidates old entries
+    - Stores the parsed JSON response; revalidated against the stage schema
+      on read and evicted if validation fails
+    - TTL via expires_at; expired rows are deleted lazily on lookup
+    """
+    __tablename__ = "llm_cache"
+
+    cache_key: str = Field(primary_key=True, description="Hash of stage|prompt_version|model|content_hash")
+    stage: str = Field(index=True, description="Workflow stage: 'extraction', 'scoring', 'followup'")
+    prompt_version: str = Field(description="Prompt version used to produce this response")
+    model_name: str = Field(description="LLM model that produced this response")
+    content_hash: str = Field(index=True, description="Content hash of the input the response was computed from")
+    response: Optional[dict] = Field(
+        default=None,
+        sa_column=Column(JSONB),
+        description="Parsed JSON response from the LLM"
+    )
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    expires_at: Optional[datetime] = Field(default=None, description="Entry is ignored and deleted after this time")
+
+
 # Pydantic models for API requests/responses (separate from database models)
 class BusinessListingResponse(SQLModel):
     """Response model for business listings with latest data"""
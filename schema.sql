@@ -13,6 +13,7 @@ CREATE TABLE raw_listings (
     listing_url TEXT NOT NULL, -- Full URL of the scraped listing
     scrape_timestamp TIMESTAMPTZ NOT NULL DEFAULT NOW(),
     raw_html TEXT, -- Full raw HTML content (can be large)
+    raw_html_sha256 TEXT, -- Content hash into raw_blobs; set instead of raw_html for deduplicated storage
     raw_text TEXT, -- Extracted plaintext content
     listing_category TEXT, -- Raw category from marketplace
     seller_country TEXT, -- Raw country/location data
@@ -22,12 +23,35 @@ CREATE TABLE raw_listings (
     created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
 );
 
+-- Content-addressed storage for large scraped blobs; listings sharing
+-- boilerplate HTML store the content once and point at it by hash
+CREATE TABLE raw_blobs (
+    content_sha256 TEXT PRIMARY KEY, -- SHA-256 hex digest of content
+    content TEXT NOT NULL, -- The raw blob content
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
 -- Indexes for common query patterns
-CREATE INDEX ix_raw_listings_business_id ON raw_listings(business_id);
+CREATE INDEX ix_raw_listings_raw_html_sha256 ON raw_listings(raw_html_sha256);
 CREATE INDEX ix_raw_listings_marketplace ON raw_listings(marketplace);
-CREATE INDEX ix_raw_listings_scrape_timestamp ON raw_listings(scrape_timestamp);
--- Composite index for finding latest scrape per business
-CREATE INDEX ix_raw_listings_business_scrape ON raw_listings(business_id, scrape_timestamp);
+-- Backs the scraper's candidate-URL anti-join dedup probe
+CREATE INDEX ix_raw_listings_listing_url ON raw_listings(listing_url);
+-- Arbiter for the scraper's ON CONFLICT (business_id, listing_url) DO NOTHING
+ALTER TABLE raw_listings ADD CONSTRAINT uq_raw_listings_business_url
+    UNIQUE (business_id, listing_url);
+-- BRIN: timestamps on this append-only table correlate with heap order,
+-- so block-range entries answer time-range scans at ~1/1000 the btree size
+CREATE INDEX ix_raw_listings_scrape_ts_brin ON raw_listings USING brin (scrape_timestamp) WITH (pages_per_range = 32);
+-- Keep the scraped blobs in TOAST uncompressed (EXTERNAL instead of the
+-- EXTENDED default): most readers select only metadata columns, and inline
+-- compression would make every blob read pay the TOAST decompressor
+ALTER TABLE raw_listings ALTER COLUMN raw_html SET STORAGE EXTERNAL;
+ALTER TABLE raw_listings ALTER COLUMN raw_text SET STORAGE EXTERNAL;
+
+-- Covering index: DESC matches the latest-scrape ORDER BY ... LIMIT 1, and
+-- INCLUDE answers url/marketplace lookups by index-only scan
+CREATE INDEX ix_raw_listings_business_scrape ON raw_listings(business_id, scrape_timestamp DESC)
+    INCLUDE (listing_url, marketplace);
 
 -- Comments explaining design choices
 COMMENT ON TABLE raw_listings IS 'Raw scraped listing data - append-only storage preserving verbatim marketplace data';
@@ -73,14 +97,35 @@ CREATE TABLE canonical_business_records (
     -- Confidence and uncertainty flags
     confidence_flags JSONB, -- missing_financials, ambiguous_metrics[], assumptions_made[]
 
+    -- Hot scalars denormalized from the JSONB domains for typed filtering;
+    -- the JSONB stays authoritative
+    asking_price_usd DOUBLE PRECISION,
+    monthly_revenue_usd DOUBLE PRECISION,
+    monthly_profit_usd DOUBLE PRECISION,
+    business_vertical TEXT,
+    customer_count INTEGER,
+
     created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
 );
 
 -- Indexes for common query patterns
-CREATE INDEX ix_canonical_business_business_id ON canonical_business_records(business_id);
-CREATE INDEX ix_canonical_business_created_at ON canonical_business_records(created_at);
+CREATE INDEX ix_canonical_created_brin ON canonical_business_records USING brin (created_at) WITH (pages_per_range = 32);
 -- Composite index for finding latest version per business
 CREATE INDEX ix_canonical_business_version ON canonical_business_records(business_id, version DESC);
+-- Backs the single-statement INSERT ... ON CONFLICT DO NOTHING upsert
+CREATE UNIQUE INDEX ux_canonical_business_contenthash ON canonical_business_records(business_id, content_hash);
+-- Serves latest-record-per-business LIMIT 1 lookups without a sort
+CREATE INDEX ix_canonical_business_id_created_at ON canonical_business_records(business_id, created_at DESC);
+-- Containment/path filters on the hot JSONB domains (jsonb_path_ops: small
+-- entries, supports @> containment but not key-existence operators)
+CREATE INDEX ix_canonical_financials_gin ON canonical_business_records USING gin (financials jsonb_path_ops);
+CREATE INDEX ix_canonical_product_gin ON canonical_business_records USING gin (product jsonb_path_ops);
+CREATE INDEX ix_canonical_risks_gin ON canonical_business_records USING gin (risks jsonb_path_ops);
+-- Functional btree for range filters and sorts on asking price
+CREATE INDEX ix_canonical_asking_price ON canonical_business_records (((financials->>'asking_price_usd')::numeric));
+-- Screening filters on the denormalized scalars; vertical-only probes use
+-- the composite's leading column
+CREATE INDEX ix_canonical_vertical_price_revenue ON canonical_business_records(business_vertical, asking_price_usd, monthly_revenue_usd);
 
 -- Comments explaining design choices
 COMMENT ON TABLE canonical_business_records IS 'Normalized business facts from categorization agent - append-only versioning';
@@ -120,13 +165,13 @@ CREATE TABLE scoring_records (
 );
 
 -- Indexes optimized for scoring queries
-CREATE INDEX ix_scoring_records_business_id ON scoring_records(business_id);
 CREATE INDEX ix_scoring_records_canonical_record_id ON scoring_records(canonical_record_id);
 CREATE INDEX ix_scoring_records_total_score ON scoring_records(total_score DESC);
-CREATE INDEX ix_scoring_records_tier ON scoring_records(tier);
 CREATE INDEX ix_scoring_records_scoring_timestamp ON scoring_records(scoring_timestamp);
 -- Composite indexes for common query patterns
 CREATE INDEX ix_scoring_tier_timestamp ON scoring_records(tier, scoring_timestamp DESC);
+-- Leaderboard queries: top-N by score within a tier as a pure index scan
+CREATE INDEX ix_scoring_tier_total_desc ON scoring_records(tier, total_score DESC);
 CREATE INDEX ix_scoring_business_timestamp ON scoring_records(business_id, scoring_timestamp DESC);
 
 -- Comments explaining design choices
@@ -158,10 +203,8 @@ CREATE TABLE follow_up_questions (
 );
 
 -- Indexes for follow-up queries
-CREATE INDEX ix_followup_business_id ON follow_up_questions(business_id);
 CREATE INDEX ix_followup_canonical_record_id ON follow_up_questions(canonical_record_id);
 CREATE INDEX ix_followup_response_status ON follow_up_questions(response_status);
-CREATE INDEX ix_followup_severity ON follow_up_questions(severity);
 -- Composite indexes for common query patterns
 CREATE INDEX ix_followup_business_status ON follow_up_questions(business_id, response_status);
 CREATE INDEX ix_followup_severity_created ON follow_up_questions(severity, created_at);
@@ -192,10 +235,8 @@ CREATE TABLE agent_execution_logs (
 );
 
 -- Indexes for monitoring and debugging queries
-CREATE INDEX ix_agent_exec_agent_name ON agent_execution_logs(agent_name);
-CREATE INDEX ix_agent_exec_business_id ON agent_execution_logs(business_id);
 CREATE INDEX ix_agent_exec_status ON agent_execution_logs(status);
-CREATE INDEX ix_agent_exec_started_at ON agent_execution_logs(started_at);
+CREATE INDEX ix_agent_exec_started_brin ON agent_execution_logs USING brin (started_at) WITH (pages_per_range = 32);
 -- Composite indexes for common query patterns
 CREATE INDEX ix_agent_exec_business_status ON agent_execution_logs(business_id, status);
 CREATE INDEX ix_agent_exec_name_started ON agent_execution_logs(agent_name, started_at DESC);
@@ -243,7 +284,28 @@ ALTER TABLE follow_up_questions ADD CONSTRAINT check_response_after_question
     CHECK (response_timestamp IS NULL OR response_timestamp >= created_at);
 
 -- =============================================================================
--- 6. SECTOR DEEP RESEARCH AGENT OUTPUTS
+-- 6. LLM RESPONSE CACHE
+-- Content-addressable cache of parsed LLM responses per workflow stage
+-- =============================================================================
+
+CREATE TABLE llm_cache (
+    cache_key TEXT PRIMARY KEY, -- Hash of (stage | prompt_version | model | content_hash)
+    stage TEXT NOT NULL, -- 'extraction', 'scoring', 'followup'
+    prompt_version TEXT NOT NULL, -- Bumping the prompt version invalidates old entries
+    model_name TEXT NOT NULL, -- LLM model that produced this response
+    content_hash TEXT NOT NULL, -- Content hash of the input the response was computed from
+    response JSONB, -- Parsed JSON response from the LLM
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    expires_at TIMESTAMPTZ -- Entry is ignored and deleted after this time
+);
+
+CREATE INDEX ix_llm_cache_stage ON llm_cache(stage);
+CREATE INDEX ix_llm_cache_content_hash ON llm_cache(content_hash);
+
+COMMENT ON TABLE llm_cache IS 'Content-addressable cache of LLM responses - cache hits skip the LLM call entirely';
+
+-- =============================================================================
+-- 7. SECTOR DEEP RESEARCH AGENT OUTPUTS
 -- Stores structured outputs from deep research agents (market, platform, etc.)
 -- Append-only, versioned, reusable across businesses
 -- =============================================================================
@@ -0,0 +1,120 @@
+"""
+Canonical business record schema for the categorization workflow.
+
+Kept in its own module so extraction-only workers pay the pydantic
+schema-build cost for just these models at import time; the scoring and
+follow-up schemas live in schemas_scoring / schemas_followup and are
+imported on first use.
+"""
+
+from typing import Optional
+
+from pydantic import BaseModel, Field, RootModel
+
+
+class FinancialsDomain(BaseModel):
+    """Financial metrics and valuation data"""
+    asking_price_usd: Optional[float] = Field(None, description="Asking price in USD")
+    monthly_revenue_usd: Optional[float] = Field(None, description="Monthly recurring revenue in USD")
+    annual_revenue_usd: Optional[float] = Field(None, description="Annual revenue in USD")
+    monthly_profit_usd: Optional[float] = Field(None, description="Monthly profit in USD")
+    annual_profit_usd: Optional[float] = Field(None, description="Annual profit in USD")
+    profit_margin_percent: Optional[float] = Field(None, description="Profit margin as percentage")
+    revenue_growth_rate_percent: Optional[float] = Field(None, description="Year-over-year revenue growth rate")
+
+
+class ProductDomain(BaseModel):
+    """Product and business model details"""
+    business_type: Optional[str] = Field(None, description="Type of business (SaaS, e-commerce, etc.)")
+    vertical: Optional[str] = Field(None, description="Industry vertical")
+    product_category: Optional[str] = Field(None, description="Specific product category")
+    features: Optional[list[str]] = Field(None, description="Key product features")
+    target_market: Optional[str] = Field(None, description="Target customer segment")
+    business_model: Optional[str] = Field(None, description="Revenue model (subscription, transaction, etc.)")
+
+
+class CustomersDomain(BaseModel):
+    """Customer metrics and segmentation"""
+    total_customers: Optional[int] = Field(None, description="Total number of customers")
+    monthly_active_users: Optional[int] = Field(None, description="Monthly active users")
+    paying_customers: Optional[int] = Field(None, description="Number of paying customers")
+    churn_rate_percent: Optional[float] = Field(None, description="Monthly churn rate as percentage")
+    customer_concentration_risk: Optional[str] = Field(None, description="Assessment of customer concentration risk")
+    customer_segments: Optional[list[str]] = Field(None, description="Customer segments served")
+
+
+class OperationsDomain(BaseModel):
+    """Operational details and requirements"""
+    owner_hours_per_week: Optional[int] = Field(None, description="Hours per week owner spends on business")
+    full_time_employees: Optional[int] = Field(None, description="Number of full-time employees")
+    part_time_employees: Optional[int] = Field(None, description="Number of part-time employees")
+    key_dependencies: Optional[list[str]] = Field(None, description="Critical operational dependencies")
+    key_person_risk: Optional[str] = Field(None, description="Assessment of key person dependency risk")
+    scalability_factors: Optional[list[str]] = Field(None, description="Factors limiting or enabling scalability")
+
+
+class TechnologyDomain(BaseModel):
+    """Technology stack and infrastructure"""
+    tech_stack: Optional[list[str]] = Field(None, description="Primary technologies used")
+    hosting_provider: Optional[str] = Field(None, description="Hosting/cloud provider")
+    code_ownership: Optional[str] = Field(None, description="Code ownership status (owned, leased, etc.)")
+    api_dependencies: Optional[list[str]] = Field(None, description="External API dependencies")
+    data_storage: Optional[str] = Field(None, description="Primary data storage solution")
+    development_status: Optional[str] = Field(None, description="Development/documentation status")
+
+
+class GrowthDomain(BaseModel):
+    """Growth metrics and strategies"""
+    growth_channels: Optional[list[str]] = Field(None, description="Primary customer acquisition channels")
+    monthly_growth_rate_percent: Optional[float] = Field(None, description="Monthly growth rate")
+    marketing_spend_percent: Optional[float] = Field(None, description="Marketing spend as percentage of revenue")
+    customer_acquisition_cost: Optional[float] = Field(None, description="Customer acquisition cost")
+    lifetime_value: Optional[float] = Field(None, description="Customer lifetime value")
+    growth_trends: Optional[str] = Field(None, description="Growth trend assessment")
+
+
+class RisksDomain(BaseModel):
+    """Risk assessment and mitigation factors"""
+    platform_dependency_risk: Optional[str] = Field(None, description="Dependency on specific platforms")
+    regulatory_risk: Optional[str] = Field(None, description="Regulatory or compliance risks")
+    ip_risk: Optional[str] = Field(None, description="Intellectual property risks")
+    competitive_risk: Optional[str] = Field(None, description="Competitive landscape risks")
+    technical_debt: Optional[str] = Field(None, description="Technical debt assessment")
+    market_risk: Optional[str] = Field(None, description="Market-related risks")
+
+
+class SellerDomain(BaseModel):
+    """Seller details and motivations"""
+    location: Optional[str] = Field(None, description="Seller's location/country")
+    selling_reason: Optional[str] = Field(None, description="Primary reason for selling")
+    post_sale_involvement: Optional[str] = Field(None, description="Willingness to assist post-sale")
+    transition_period: Optional[str] = Field(None, description="Available transition support period")
+    seller_experience: Optional[str] = Field(None, description="Seller's experience level")
+    business_age_years: Optional[float] = Field(None, description="Age of business in years")
+
+
+class ConfidenceFlagsDomain(BaseModel):
+    """Uncertainty indicators and data quality flags"""
+    missing_financial_data: Optional[bool] = Field(None, description="Critical financial data is missing")
+    assumed_values: Optional[list[str]] = Field(None, description="Fields where assumptions were made")
+    contradictory_information: Optional[list[str]] = Field(None, description="Areas with contradictory data")
+    requires_followup: Optional[list[str]] = Field(None, description="Topics requiring seller clarification")
+    data_quality_score: Optional[int] = Field(None, description="Overall data quality score (1-10)")
+    confidence_level: Optional[str] = Field(None, description="Overall confidence in extracted data")
+
+
+class CanonicalRecord(BaseModel):
+    """Complete canonical business record schema"""
+    financials: Optional[FinancialsDomain] = Field(None)
+    product: Optional[ProductDomain] = Field(None)
+    customers: Optional[CustomersDomain] = Field(None)
+    operations: Optional[OperationsDomain] = Field(None)
+    technology: Optional[TechnologyDomain] = Field(None)
+    growth: Optional[GrowthDomain] = Field(None)
+    risks: Optional[RisksDomain] = Field(None)
+    seller: Optional[SellerDomain] = Field(None)
+    confidence_flags: Optional[ConfidenceFlagsDomain] = Field(None)
+
+
+class CanonicalRecordBatch(RootModel[list[CanonicalRecord]]):
+    """Array of canonical records, for batched multi-listing extraction"""
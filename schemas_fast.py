@@ -0,0 +1,62 @@
+"""
+msgspec.Struct mirrors of the hot LLM output schemas.
+
+These validate raw scoring and follow-up LLM output several times faster than
+the pydantic constructors. The DB-facing pydantic models stay the source of
+truth for field semantics; callers rebuild them with model_construct after
+msgspec has done the validation, so the rest of the pipeline is unchanged.
+"""
+
+from typing import Annotated, List, Optional
+
+import msgspec
+from msgspec import Meta
+
+
+Score = Annotated[float, Meta(ge=0, le=100)]
+Severity = Annotated[str, Meta(pattern="^(critical|high|medium|low)$")]
+
+
+class ConfidenceFlagsFast(msgspec.Struct, frozen=True):
+    """Slotted in-process mirror of ConfidenceFlagsDomain.
+
+    Used when confidence flags are rebuilt from DB/state JSON purely for
+    attribute access in penalty and uncertainty analysis; far cheaper to
+    instantiate than the pydantic model and immutable by construction.
+    """
+    missing_financial_data: Optional[bool] = None
+    assumed_values: Optional[List[str]] = None
+    contradictory_information: Optional[List[str]] = None
+    requires_followup: Optional[List[str]] = None
+    data_quality_score: Optional[int] = None
+    confidence_level: Optional[str] = None
+
+
+class ScoringComponentsFast(msgspec.Struct):
+    """Component scores from LLM analysis (0-100 scale)"""
+    price_efficiency_score: Score
+    revenue_quality_score: Score
+    moat_score: Score
+    ai_leverage_score: Score
+    operations_score: Score
+    risk_score: Score
+    trust_score: Score
+
+
+class ScoringOutputFast(msgspec.Struct):
+    """Complete scoring output from LLM"""
+    component_scores: ScoringComponentsFast
+    top_buy_reasons: Annotated[List[str], Meta(min_length=1, max_length=5)]
+    top_risks: Annotated[List[str], Meta(min_length=1, max_length=5)]
+
+
+class FollowUpQuestionFast(msgspec.Struct):
+    """Individual follow-up question with metadata"""
+    question_text: Annotated[str, Meta(min_length=10, max_length=500)]
+    triggered_by_field: Annotated[str, Meta(min_length=1, max_length=100)]
+    severity: Severity
+
+
+class FollowUpQuestionsOutputFast(msgspec.Struct):
+    """Complete follow-up questions output from LLM"""
+    questions: Annotated[List[FollowUpQuestionFast], Meta(max_length=8)]
@@ -0,0 +1,32 @@
+"""
+Follow-up question output schema for the categorization workflow.
+
+Imported lazily by the follow-up paths so extraction-only workers don't pay
+the pydantic schema-build cost for these models at startup.
+"""
+
+from typing import List
+
+from pydantic import BaseModel, Field, field_validator
+
+# O(1) membership check instead of a per-question regex invocation
+_SEVERITIES = frozenset({"critical", "high", "medium", "low"})
+
+
+class FollowUpQuestion(BaseModel):
+    """Individual follow-up question with metadata"""
+    question_text: str = Field(..., min_length=10, max_length=500, description="Generated question for seller")
+    triggered_by_field: str = Field(..., min_length=1, max_length=100, description="Field/uncertainty that triggered this question")
+    severity: str = Field(..., description="Question priority level: 'critical', 'high', 'medium', 'low'")
+
+    @field_validator('severity')
+    @classmethod
+    def _check_severity(cls, value: str) -> str:
+        if value not in _SEVERITIES:
+            raise ValueError(f"severity must be one of {sorted(_SEVERITIES)}")
+        return value
+
+
+class FollowUpQuestionsOutput(BaseModel):
+    """Complete follow-up questions output from LLM"""
+    questions: List[FollowUpQuestion] = Field(..., max_items=8, description="Generated follow-up questions")
@@ -0,0 +1,28 @@
+"""
+Scoring output schema for the categorization workflow.
+
+Imported lazily by the scoring paths so extraction-only workers don't pay
+the pydantic schema-build cost for these models at startup.
+"""
+
+from typing import List
+
+from pydantic import BaseModel, Field
+
+
+class ScoringComponents(BaseModel):
+    """Component scores from LLM analysis (0-100 scale)"""
+    price_efficiency_score: float = Field(..., ge=0, le=100, description="Price relative to revenue/profit quality")
+    revenue_quality_score: float = Field(..., ge=0, le=100, description="Revenue stability and growth quality")
+    moat_score: float = Field(..., ge=0, le=100, description="Competitive moat and defensibility")
+    ai_leverage_score: float = Field(..., ge=0, le=100, description="AI/ML automation potential")
+    operations_score: float = Field(..., ge=0, le=100, description="Operational efficiency and scalability")
+    risk_score: float = Field(..., ge=0, le=100, description="Overall risk assessment")
+    trust_score: float = Field(..., ge=0, le=100, description="Trust in reported data quality")
+
+
+class ScoringOutput(BaseModel):
+    """Complete scoring output from LLM"""
+    component_scores: ScoringComponents
+    top_buy_reasons: List[str] = Field(..., min_items=1, max_items=5, description="Top reasons to pursue acquisition")
+    top_risks: List[str] = Field(..., min_items=1, max_items=5, description="Top risks identified")
@@ -4,18 +4,24 @@ Automated Acquire.com scraper with Chrome startup and login
 """
 import os
 import sys
+import hashlib
 import json
+import queue
 import uuid
+import re
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import psycopg2
+from psycopg2.extras import execute_values
+from psycopg2.pool import ThreadedConnectionPool
 import subprocess
-from urllib.parse import urlparse, urljoin
+from urllib.parse import urljoin
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from bs4 import BeautifulSoup
+from lxml import etree, html as lxml_html
 import requests
 
 # -----------------------
@@ -32,18 +38,61 @@ DB_CONFIG = {
 
 MARKETPLACE = "acquire.com"
 
+# Listing pages are scraped by a pool of Chrome instances, one per worker
+# thread, on consecutive debug ports starting at DEBUG_PORT_BASE
+SCRAPE_WORKERS = int(os.getenv("SCRAPE_WORKERS", "4"))
+DEBUG_PORT_BASE = 9222
+
 # Stable namespace UUID for business_id generation
 BUSINESS_NAMESPACE = uuid.UUID("12345678-1234-5678-1234-567812345678")
+_NAMESPACE_BYTES = BUSINESS_NAMESPACE.bytes
+
+# Locators built once at import: Selenium re-parses the locator tuple on
+# every find/wait call, and these run on each of the thousands of listing
+# pages a scrape visits
+EMAIL_WAIT_LOC = (By.CSS_SELECTOR, "input[type='email'], input[name='email'], input[placeholder*='email' i]")
+EMAIL_LOC = (By.CSS_SELECTOR, "input[type='email'], input[name='email']")
+EMAIL_PLACEHOLDER_LOC = (By.CSS_SELECTOR, "input[placeholder*='email' i], input[placeholder*='Email' i]")
+PASSWORD_LOC = (By.CSS_SELECTOR, "input[type='password'], input[name='password']")
+SUBMIT_LOC = (By.CSS_SELECTOR, "button[type='submit']")
+LOGIN_BUTTON_TEXT_LOC = (By.XPATH, "//button[contains(text(), 'Sign') or contains(text(), 'Log') or contains(text(), 'Login')]")
+PUBLIC_INFO_LOC = (By.CLASS_NAME, "public-info-block")
+
+# Compiled once: XPath compilation is not free and this runs per page.
+# The expression matches a class token exactly, like BeautifulSoup's
+# class_= lookup did.
+# Whole-parameter match for source=marketplace in the query string, without
+# building a dict of every anchor's params just to read one key
+_MARKETPLACE_QUERY = re.compile(r"\?(?:[^#]*&)?source=marketplace(?:&|#|$)")
+_INFO_BLOCK_XPATH = etree.XPath(
+    "//*[contains(concat(' ', normalize-space(@class), ' '), ' public-info-block ')]"
+)
+
+def _block_text(element):
+    """Newline-joined stripped text of an element (bs4 get_text parity)"""
+    return "\n".join(
+        stripped for text in element.itertext() if (stripped := text.strip())
+    )
+
+# Lazily-built connection pool: the TCP+auth handshake is paid once per
+# pooled connection instead of once per query
+_POOL = None
+
+def _get_pool():
+    global _POOL
+    if _POOL is None:
+        _POOL = ThreadedConnectionPool(1, 8, **DB_CONFIG)
+    return _POOL
 
 # -----------------------
 # HELPERS
 # -----------------------
 
-def is_chrome_running():
-    """Check if Chrome is running on port 9222"""
+def is_chrome_running(port=DEBUG_PORT_BASE):
+    """Check if Chrome is running on the given debug port"""
     try:
-        print("Checking if Chrome is running on port 9222...", file=sys.stderr)
-        response = requests.get("http://127.0.0.1:9222/json/version", timeout=5)
+        print(f"Checking if Chrome is running on port {port}...", file=sys.stderr)
+        response = requests.get(f"http://127.0.0.1:{port}/json/version", timeout=5)
         is_running = response.status_code == 200
         print(f"Chrome running check: {is_running}", file=sys.stderr)
         return is_running
@@ -51,9 +100,12 @@ def is_chrome_running():
         print(f"Chrome check failed: {e}", file=sys.stderr)
         return False
 
-def start_chrome():
-    """Start Chrome with remote debugging"""
-    user_data_dir = os.path.expanduser("~/chrome-debug")
+def start_chrome(port=DEBUG_PORT_BASE):
+    """Start Chrome with remote debugging on the given port"""
+    # Each instance needs its own profile; the base port keeps the original
+    # directory so existing sessions survive
+    suffix = "" if port == DEBUG_PORT_BASE else f"-{port}"
+    user_data_dir = os.path.expanduser(f"~/chrome-debug{suffix}")
 
     # Ensure user data directory exists
     os.makedirs(user_data_dir, exist_ok=True)
@@ -61,7 +113,7 @@ def start_chrome():
     chrome_path = "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome"
     cmd = [
         chrome_path,
-        "--remote-debugging-port=9222",
+        f"--remote-debugging-port={port}",
         f"--user-data-dir={user_data_dir}",
         "--no-first-run",
         "--disable-default-apps",
@@ -73,17 +125,54 @@ def start_chrome():
         "--disable-renderer-backgrounding"
     ]
 
-    print("Starting Chrome with remote debugging...", file=sys.stderr)
+    print(f"Starting Chrome with remote debugging on port {port}...", file=sys.stderr)
     process = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True)
 
     # Wait for Chrome to start
     for i in range(30):  # Wait up to 30 seconds
-        if is_chrome_running():
+        if is_chrome_running(port):
             print("Chrome started successfully", file=sys.stderr)
             return True
         time.sleep(1)
 
-    raise Exception("Failed to start Chrome within 30 seconds")
+    raise Exception(f"Failed to start Chrome on port {port} within 30 seconds")
+
+def create_driver(port=DEBUG_PORT_BASE):
+    """Connect a WebDriver to the Chrome instance on the given port"""
+    chrome_options = Options()
+    chrome_options.add_experimental_option("debuggerAddress", f"127.0.0.1:{port}")
+    driver = webdriver.Chrome(options=chrome_options)
+
+    # Set reasonable timeouts to prevent hanging
+    driver.set_page_load_timeout(30)  # 30 seconds for page loads
+    driver.implicitly_wait(10)  # 10 seconds for element finding
+    return driver
+
+def wait_for_lazy_content(driver, timeout=6.0, settle=0.25):
+    """Wait until the page's link count stops growing.
+
+    Replaces fixed sleeps: a page that has already settled continues after
+    one settle interval, a slow one gets up to `timeout` to finish loading
+    its lazy content.
+    """
+    deadline = time.time() + timeout
+    last_count = -1
+    while time.time() < deadline:
+        count = driver.execute_script("return document.links.length")
+        if count == last_count:
+            return
+        last_count = count
+        time.sleep(settle)
+
+def _wait(driver, timeout=15):
+    """One WebDriverWait per (driver, timeout), cached on the driver itself"""
+    waits = getattr(driver, "_waits", None)
+    if waits is None:
+        waits = driver._waits = {}
+    wait = waits.get(timeout)
+    if wait is None:
+        wait = waits[timeout] = WebDriverWait(driver, timeout)
+    return wait
 
 def navigate_to_all_listing(driver):
     """Navigate to the all-listing page where business listings are located"""
@@ -95,7 +184,7 @@ def navigate_to_all_listing(driver):
 
     # Wait for the page to load
     try:
-        WebDriverWait(driver, 15).until(
+        _wait(driver).until(
             lambda driver: "all-listing" in driver.current_url or "listing" in driver.current_url
         )
         print("Successfully navigated to all-listing page", file=sys.stderr)
@@ -104,17 +193,17 @@ def navigate_to_all_listing(driver):
         print(f"Warning: Could not verify all-listing URL, continuing anyway", file=sys.stderr)
         print(f"Current URL: {driver.current_url}, Error: {e}", file=sys.stderr)
 
-    # Scroll through the page to load all lazy content
+    # Scroll through the page to load all lazy content, waiting only as
+    # long as new listings keep appearing at each step
     print("Scrolling through all-listing page to load all business listings...", file=sys.stderr)
-    driver.execute_script("window.scrollTo(0, document.body.scrollHeight / 4);")
-    time.sleep(2)
-    driver.execute_script("window.scrollTo(0, document.body.scrollHeight / 2);")
-    time.sleep(2)
-    driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-    time.sleep(3)
+    for target in ("document.body.scrollHeight / 4",
+                   "document.body.scrollHeight / 2",
+                   "document.body.scrollHeight"):
+        driver.execute_script(f"window.scrollTo(0, {target});")
+        wait_for_lazy_content(driver)
     print("Finished scrolling - all business listings should be loaded", file=sys.stderr)
 
-def login_to_acquire(driver):
+def login_to_acquire(driver, navigate=True):
     """Login to acquire.com"""
     email = os.getenv("ACQUIRE_EMAIL")
     password = os.getenv("ACQUIRE_PASSWORD")
@@ -141,8 +230,8 @@ def login_to_acquire(driver):
 
         # Wait for email input field
         try:
-            WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "input[type='email'], input[name='email'], input[placeholder*='email' i]"))
+            _wait(driver, 10).until(
+                EC.presence_of_element_located(EMAIL_WAIT_LOC)
             )
         except:
             print("No email input field found - might already be logged in", file=sys.stderr)
@@ -153,27 +242,27 @@ def login_to_acquire(driver):
         return
 
     # Find and fill email field
-    email_inputs = driver.find_elements(By.CSS_SELECTOR, "input[type='email'], input[name='email']")
+    email_inputs = driver.find_elements(*EMAIL_LOC)
     if not email_inputs:
         # Try alternative selectors
-        email_inputs = driver.find_elements(By.CSS_SELECTOR, "input[placeholder*='email' i], input[placeholder*='Email' i]")
+        email_inputs = driver.find_elements(*EMAIL_PLACEHOLDER_LOC)
         if not email_inputs:
             raise Exception("Could not find email input field")
 
     email_inputs[0].send_keys(email)
 
     # Find and fill password field
-    password_inputs = driver.find_elements(By.CSS_SELECTOR, "input[type='password'], input[name='password']")
+    password_inputs = driver.find_elements(*PASSWORD_LOC)
     if not password_inputs:
         raise Exception("Could not find password input field")
 
     password_inputs[0].send_keys(password)
 
     # Find and click login button
-    login_buttons = driver.find_elements(By.CSS_SELECTOR, "button[type='submit']")
+    login_buttons = driver.find_elements(*SUBMIT_LOC)
     if not login_buttons:
         # Try finding buttons by text content
-        login_buttons = driver.find_elements(By.XPATH, "//button[contains(text(), 'Sign') or contains(text(), 'Log') or contains(text(), 'Login')]")
+        login_buttons = driver.find_elements(*LOGIN_BUTTON_TEXT_LOC)
         if not login_buttons:
             # Try pressing Enter on password field
             password_inputs[0].send_keys("\n")
@@ -185,7 +274,7 @@ def login_to_acquire(driver):
     # Wait for login to complete
     try:
         print("Waiting for login to complete...", file=sys.stderr)
-        WebDriverWait(driver, 15).until(EC.url_contains("app.acquire.com"))
+        _wait(driver).until(EC.url_contains("app.acquire.com"))
         print("Login successful", file=sys.stderr)
     except Exception as e:
         # Check if we're still on login page
@@ -194,39 +283,45 @@ def login_to_acquire(driver):
         if "login" in current_url:
             raise Exception("Login may have failed - still on login page")
 
-    # Wait 10 seconds after login before navigating to allow session to stabilize
-    print("Waiting 10 seconds for session to stabilize...", file=sys.stderr)
-    time.sleep(10)
+    # Wait for the post-login redirect to land and the page to finish
+    # loading instead of a blind 10s sleep
+    print("Waiting for session to stabilize...", file=sys.stderr)
+    try:
+        _wait(driver).until(
+            lambda d: "login" not in d.current_url
+            and d.execute_script("return document.readyState") == "complete"
+        )
+    except Exception:
+        print("Post-login page did not settle within 15s - continuing", file=sys.stderr)
     print("Current URL before navigation:", driver.current_url, file=sys.stderr)
 
-    # Navigate to all-listing page after login
-    navigate_to_all_listing(driver)
+    # Navigate to all-listing page after login (worker drivers skip this;
+    # they only ever load individual listing pages)
+    if navigate:
+        navigate_to_all_listing(driver)
 
 def extract_hrefs(driver, url):
     """Extract business listing URLs with source=marketplace from current page"""
     # Note: url parameter is kept for compatibility but we're working with current page
     print("Extracting business URLs from current page...", file=sys.stderr)
 
-    # Wait a bit for any dynamic content to load
-    time.sleep(2)
+    # Wait for any dynamic content to finish appearing
+    wait_for_lazy_content(driver)
 
-    soup = BeautifulSoup(driver.page_source, "html.parser")
+    # Collect candidate hrefs in the browser itself: a tiny JS expression
+    # returns just the link strings, instead of serializing the whole SPA
+    # DOM through page_source and parsing it Python-side
+    raw_hrefs = driver.execute_script(
+        "return Array.from(document.querySelectorAll('a[href^=\"/startup/\"]'))"
+        ".map(a => a.getAttribute('href'))"
+    )
 
     hrefs = set()
-    for a in soup.find_all("a", href=True):
-        href = a["href"]
-
-        # Only process relative URLs (starting with /)
-        if href and href.startswith('/'):
-            # Parse the URL to check query parameters
-            parsed = urlparse(href)
-            query_params = dict(q.split('=', 1) for q in parsed.query.split('&') if '=' in q) if parsed.query else {}
-
-            # Only include URLs with source=marketplace and startup path
-            if (query_params.get('source') == 'marketplace' and
-                parsed.path.startswith('/startup/')):
-                full_url = urljoin("https://app.acquire.com", href)  # Use base URL since we're on browse
-                hrefs.add(full_url)
+    for href in raw_hrefs:
+        # Only include URLs with source=marketplace
+        if _MARKETPLACE_QUERY.search(href):
+            full_url = urljoin("https://app.acquire.com", href)  # Use base URL since we're on browse
+            hrefs.add(full_url)
 
     print(f"Found {len(hrefs)} business listing URLs", file=sys.stderr)
     return sorted(hrefs)
@@ -236,46 +331,79 @@ def extract_public_info_text(driver, url):
     driver.get(url)
 
     # Wait for the public-info-block to appear
-    WebDriverWait(driver, 15).until(
-        EC.presence_of_element_located((By.CLASS_NAME, "public-info-block"))
+    _wait(driver).until(
+        EC.presence_of_element_located(PUBLIC_INFO_LOC)
     )
 
     # Small delay for lazy content
     time.sleep(1)
 
-    soup = BeautifulSoup(driver.page_source, "html.parser")
+    tree = lxml_html.fromstring(driver.page_source)
 
-    blocks = soup.find_all(class_="public-info-block")
     text_blocks = []
-
-    for block in blocks:
-        text = block.get_text(separator="\n", strip=True)
+    for block in _INFO_BLOCK_XPATH(tree):
+        text = _block_text(block)
         if text:
             text_blocks.append(text)
 
     return "\n\n---\n\n".join(text_blocks)
 
 def generate_business_id(listing_url: str) -> str:
-    """Deterministically generate a stable UUID per unique listing URL"""
-    return str(uuid.uuid5(BUSINESS_NAMESPACE, listing_url))
+    """Deterministically generate a stable UUID per unique listing URL.
 
-def get_existing_urls():
-    """Get all existing URLs from database"""
-    conn = psycopg2.connect(**DB_CONFIG)
-    cursor = conn.cursor()
+    Byte-for-byte equivalent to str(uuid.uuid5(BUSINESS_NAMESPACE, url))
+    but hashes and formats directly, skipping the UUID object round-trip;
+    existing business_ids keep matching.
+    """
+    digest = bytearray(
+        hashlib.sha1(_NAMESPACE_BYTES + listing_url.encode()).digest()[:16]
+    )
+    digest[6] = (digest[6] & 0x0F) | 0x50  # version 5
+    digest[8] = (digest[8] & 0x3F) | 0x80  # RFC 4122 variant
+    h = digest.hex()
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
 
-    cursor.execute("SELECT DISTINCT listing_url FROM raw_listings")
-    existing_urls = {row[0] for row in cursor.fetchall()}
+def filter_new_urls(candidate_urls):
+    """Return the candidate URLs not yet present in raw_listings.
 
-    cursor.close()
-    conn.close()
+    Probes the candidates against the listing_url index via a temp-table
+    anti-join instead of pulling every stored URL into Python - the old
+    SELECT DISTINCT scanned and deduped the whole table per scrape run.
+    """
+    if not candidate_urls:
+        return []
 
-    return existing_urls
+    pool = _get_pool()
+    conn = pool.getconn()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(
+            "CREATE TEMP TABLE candidate_urls (url TEXT PRIMARY KEY) ON COMMIT DROP"
+        )
+        execute_values(
+            cursor,
+            "INSERT INTO candidate_urls (url) VALUES %s ON CONFLICT DO NOTHING",
+            [(url,) for url in candidate_urls],
+        )
+        cursor.execute(
+            """
+            SELECT c.url FROM candidate_urls c
+            WHERE NOT EXISTS (
+                SELECT 1 FROM raw_listings r WHERE r.listing_url = c.url
+            )
+            """
+        )
+        new_urls = sorted(row[0] for row in cursor.fetchall())
+        conn.commit()
+        cursor.close()
+        return new_urls
+    finally:
+        pool.putconn(conn)
 
 def insert_raw_listings(data):
-    """Insert scraped data into database"""
-    conn = psycopg2.connect(**DB_CONFIG)
-    cursor = conn.cursor()
+    """Insert scraped data into database in one batched statement"""
+    pool = _get_pool()
+    conn = pool.getconn()
 
     insert_sql = """
         INSERT INTO raw_listings (
@@ -286,31 +414,85 @@ def insert_raw_listings(data):
             raw_html,
             raw_text
         )
-        VALUES (%s, %s, %s, NOW(), %s, %s)
+        VALUES %s
         ON CONFLICT (business_id, listing_url) DO NOTHING
     """
 
-    inserted_count = 0
-    for url, raw_text in data.items():
-        if raw_text:  # Only insert if we have content
-            business_id = generate_business_id(url)
-            cursor.execute(
-                insert_sql,
-                (
-                    business_id,
-                    MARKETPLACE,
-                    url,
-                    None,  # raw_html
-                    raw_text,
-                )
+    # One execute_values round-trip per page instead of one execute per row
+    rows = [
+        (generate_business_id(url), MARKETPLACE, url, None, raw_text)
+        for url, raw_text in data.items()
+        if raw_text  # Only insert if we have content
+    ]
+    try:
+        cursor = conn.cursor()
+        if rows:
+            execute_values(
+                cursor, insert_sql, rows,
+                template="(%s, %s, %s, NOW(), %s, %s)",
+                page_size=500,
             )
-            inserted_count += 1
+        conn.commit()
+        cursor.close()
+        return len(rows)
+    finally:
+        pool.putconn(conn)
+
+def scrape_urls_parallel(primary_driver, urls):
+    """Scrape listing URLs concurrently over a pool of Chrome instances.
+
+    The primary (already logged-in) driver is reused as the first worker;
+    additional Chrome instances start on consecutive debug ports and log in
+    with their own profiles. Each worker thread borrows a driver from the
+    queue for one URL at a time, so no driver is ever used from two threads.
+    """
+    if not urls:
+        return {}
+
+    workers = max(1, min(SCRAPE_WORKERS, len(urls)))
+    drivers = queue.Queue()
+    drivers.put(primary_driver)
+    extra_drivers = []
+
+    for i in range(1, workers):
+        port = DEBUG_PORT_BASE + i
+        try:
+            if not is_chrome_running(port):
+                start_chrome(port)
+            extra = create_driver(port)
+            login_to_acquire(extra, navigate=False)
+            extra_drivers.append(extra)
+            drivers.put(extra)
+        except Exception as e:
+            print(f"Could not start scrape worker on port {port}: {e}", file=sys.stderr)
+
+    def scrape_one(url):
+        worker = drivers.get()
+        try:
+            return extract_public_info_text(worker, url)
+        finally:
+            drivers.put(worker)
 
-    conn.commit()
-    cursor.close()
-    conn.close()
+    results = {}
+    try:
+        with ThreadPoolExecutor(max_workers=drivers.qsize()) as executor:
+            futures = {executor.submit(scrape_one, url): url for url in urls}
+            for i, future in enumerate(as_completed(futures), 1):
+                url = futures[future]
+                try:
+                    results[url] = future.result()
+                    print(f"[{i}/{len(urls)}] Scraped: {url}", file=sys.stderr)
+                except Exception as e:
+                    print(f"❌ Failed on {url}: {e}", file=sys.stderr)
+                    results[url] = None
+    finally:
+        for extra in extra_drivers:
+            try:
+                extra.quit()
+            except Exception:
+                pass
 
-    return inserted_count
+    return results
 
 def main():
     """Main scraping function"""
@@ -326,20 +508,12 @@ def main():
         if not is_chrome_running():
             raise Exception("Chrome started but is not responding on port 9222")
 
-        # Set up Chrome options
-        chrome_options = Options()
-        chrome_options.add_experimental_option("debuggerAddress", "127.0.0.1:9222")
-
         # Create driver with timeout handling
         print("Attempting to connect to Chrome WebDriver...", file=sys.stderr)
         try:
-            driver = webdriver.Chrome(options=chrome_options)
+            driver = create_driver()
             print("Successfully connected to Chrome remote debugging session", file=sys.stderr)
 
-            # Set reasonable timeouts to prevent hanging
-            driver.set_page_load_timeout(30)  # 30 seconds for page loads
-            driver.implicitly_wait(10)  # 10 seconds for element finding
-
             # Check current tabs/pages
             try:
                 tabs = driver.window_handles
@@ -366,29 +540,18 @@ def main():
             all_urls = extract_hrefs(driver, "")  # Empty string since we're using current page
             print(f"Found {len(all_urls)} potential listing URLs", file=sys.stderr)
 
-            # Get existing URLs from database
-            existing_urls = get_existing_urls()
-            print(f"Found {len(existing_urls)} URLs already in database", file=sys.stderr)
-
-            # Filter out URLs we already have
-            new_urls = [url for url in all_urls if url not in existing_urls]
+            # Filter out URLs we already have with an indexed anti-join
+            new_urls = filter_new_urls(all_urls)
+            already_exist = len(all_urls) - len(new_urls)
+            print(f"{already_exist} URLs already in database", file=sys.stderr)
             print(f"Need to scrape {len(new_urls)} new URLs", file=sys.stderr)
 
-            # Scrape new URLs
-            results = {}
-            success_count = 0
-            error_count = 0
-
-            for i, url in enumerate(new_urls, 1):
-                try:
-                    print(f"[{i}/{len(new_urls)}] Scraping: {url}", file=sys.stderr)
-                    text = extract_public_info_text(driver, url)
-                    results[url] = text
-                    success_count += 1
-                except Exception as e:
-                    print(f"❌ Failed on {url}: {e}", file=sys.stderr)
-                    results[url] = None
-                    error_count += 1
+            # Scrape new URLs across a pool of logged-in drivers, one per
+            # worker thread - each page spends most of its time waiting on
+            # load, so throughput scales close to linearly with the pool
+            results = scrape_urls_parallel(driver, new_urls)
+            success_count = sum(1 for text in results.values() if text)
+            error_count = len(results) - success_count
 
             # Insert into database
             inserted_count = insert_raw_listings(results)
@@ -398,7 +561,7 @@ def main():
                 "message": "Scraping completed successfully",
                 "stats": {
                     "total_urls_found": len(all_urls),
-                    "already_exist": len(existing_urls),
+                    "already_exist": already_exist,
                     "scraped": success_count,
                     "failed": error_count,
                     "inserted": inserted_count,
@@ -5,24 +5,158 @@ Provides functions to log agent execution status, errors, and metadata
 for monitoring and debugging long-running background processes.
 """
 
+import atexit
+import collections
+import os
+import queue
+import secrets
+import threading
 import time
+import uuid
 from datetime import datetime
 from typing import Optional, Dict, Any
 from contextlib import contextmanager
-from database import get_session_sync
+from sqlalchemy import bindparam, text
+from database import engine
 from models import AgentExecutionLog
 
+# Batched log writer. Agent invocations enqueue rows and a single daemon
+# thread flushes them in one commit per batch, so the agent's critical path
+# never waits on a Postgres round-trip. A batch goes out when it reaches
+# AGENT_LOG_BATCH_SIZE rows or its oldest entry has waited AGENT_LOG_BATCH_MS,
+# whichever comes first.
+_LOG_BATCH_SIZE = int(os.getenv("AGENT_LOG_BATCH_SIZE", "100"))
+_LOG_BATCH_MS = int(os.getenv("AGENT_LOG_BATCH_MS", "50"))
+
+_log_queue: queue.Queue = queue.Queue()
+_SHUTDOWN = object()
+
+# Fixed-size ring holding batches that failed to flush (e.g. a brief DB
+# outage). They are retried ahead of the next batch; once the ring is full
+# the oldest entries are dropped rather than letting memory grow unbounded.
+_RETRY_RING_SIZE = int(os.getenv("AGENT_LOG_RING_SIZE", "10000"))
+_retry_ring: collections.deque = collections.deque(maxlen=_RETRY_RING_SIZE)
+_retry_lock = threading.Lock()
+
+# Statements built once at import: every batch reuses the same Core
+# constructs, so per-flush work is reduced to parameter binding and the
+# compiled-SQL cache always hits on an identical statement object
+_LOG_TABLE = AgentExecutionLog.__table__
+_LOG_INSERT = _LOG_TABLE.insert()
+_LOG_UPDATE = (
+    _LOG_TABLE.update()
+    .where(_LOG_TABLE.c.id == bindparam("b_id"))
+    .values(
+        status=bindparam("b_status"),
+        error_message=bindparam("b_error_message"),
+        completed_at=bindparam("b_completed_at"),
+        execution_metadata=bindparam("b_execution_metadata"),
+    )
+)
+
+
+def _flush_log_batch(batch):
+    """Write one batch of ('insert'|'update', payload) entries in a single transaction."""
+    # Lead with anything a previous failed flush left behind
+    with _retry_lock:
+        if _retry_ring:
+            batch = list(_retry_ring) + list(batch)
+            _retry_ring.clear()
+
+    inserts = [payload for kind, payload in batch if kind == "insert"]
+    updates = [payload for kind, payload in batch if kind == "update"]
+
+    try:
+        # Core executemany on plain dicts: these rows are fire-and-forget,
+        # so the ORM unit of work (instrumentation, identity map, flush
+        # bookkeeping) buys nothing and is skipped entirely
+        with engine.begin() as conn:
+            # Audit rows are fine to lose in the last few seconds of a
+            # crash; skip the WAL fsync wait for this transaction only
+            conn.execute(text("SET LOCAL synchronous_commit = off"))
+            if inserts:
+                conn.execute(_LOG_INSERT, inserts)
+            if updates:
+                conn.execute(_LOG_UPDATE, updates)
+    except Exception as e:
+        # Logging must never take an agent down; park the batch in the ring
+        # for the next flush attempt instead of dropping it outright
+        with _retry_lock:
+            overflow = max(0, len(_retry_ring) + len(batch) - _RETRY_RING_SIZE)
+            _retry_ring.extend(batch)
+        print(f"[LOGGER] Failed to flush {len(batch)} log entries, will retry: {e}")
+        if overflow:
+            print(f"[LOGGER] Retry ring full, dropped {overflow} oldest log entries")
+
+
+def _log_flusher_loop():
+    while True:
+        item = _log_queue.get()
+        if item is _SHUTDOWN:
+            return
+        batch = [item]
+        deadline = time.monotonic() + _LOG_BATCH_MS / 1000.0
+        while len(batch) < _LOG_BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                nxt = _log_queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if nxt is _SHUTDOWN:
+                _flush_log_batch(batch)
+                return
+            batch.append(nxt)
+        _flush_log_batch(batch)
+
+
+_log_flusher = threading.Thread(
+    target=_log_flusher_loop, name="agent-log-flusher", daemon=True
+)
+_log_flusher.start()
+
+
+def flush_now():
+    """Synchronously flush everything currently queued or awaiting retry."""
+    pending = []
+    while True:
+        try:
+            item = _log_queue.get_nowait()
+        except queue.Empty:
+            break
+        if item is not _SHUTDOWN:
+            pending.append(item)
+    if pending or _retry_ring:
+        _flush_log_batch(pending)
+
+
+def _drain_log_queue():
+    """Flush anything still queued when the interpreter shuts down."""
+    _log_queue.put(_SHUTDOWN)
+    _log_flusher.join(timeout=5)
+    flush_now()
+
+
+atexit.register(_drain_log_queue)
+
 
 @contextmanager
 def log_agent_execution(
     agent_name: str,
     business_id: Optional[str] = None,
     input_snapshot: Optional[Dict[str, Any]] = None,
-    execution_id: Optional[str] = None
+    execution_id: Optional[str] = None,
+    defer_until_complete: bool = True
 ):
     """
     Context manager for logging agent execution.
 
+    By default the row is buffered in memory and written once, with its
+    final status, when the context exits - one INSERT instead of an INSERT
+    plus an UPDATE. Pass defer_until_complete=False for long-running agents
+    that need a visible "running" row while they execute.
+
     Usage:
         with log_agent_execution("market_structure", business_id="123") as logger:
             # Do agent work
@@ -30,60 +164,54 @@ def log_agent_execution(
             logger.log_success({"tokens_used": 1500})
     """
     if not execution_id:
-        import uuid
-        execution_id = str(uuid.uuid4())[:8]
-
-    session = get_session_sync()
-    start_time = time.time()
-
-    # Create execution log entry
-    log_entry = AgentExecutionLog(
-        agent_name=agent_name,
-        business_id=business_id,
-        execution_id=execution_id,
-        input_snapshot=input_snapshot or {},
-        status="running",
-        started_at=datetime.utcnow()
-    )
+        execution_id = secrets.token_hex(4)
 
-    try:
-        session.add(log_entry)
-        session.commit()
+    # Materialize the row as a plain dict up front: nothing ORM-mapped ever
+    # crosses a thread or session boundary, so there is no detached state to
+    # recover from. The id is generated client-side so the completion update
+    # can reference it before the insert has flushed.
+    row = {
+        "id": str(uuid.uuid4()),
+        "agent_name": agent_name,
+        "business_id": business_id,
+        "execution_id": execution_id,
+        "input_snapshot": input_snapshot or {},
+        "status": "running",
+        "error_message": None,
+        "execution_metadata": None,
+        "started_at": datetime.utcnow(),
+        "completed_at": None,
+    }
+
+    if not defer_until_complete:
+        # Hand a copy of the start row to the batched writer; no commit on
+        # this thread, and later mutations of `row` cannot race the flush
+        _log_queue.put(("insert", dict(row)))
 
-        # Yield a logger object for the context
-        logger = AgentLogger(log_entry, session)
+    logger = AgentLogger(row, deferred=defer_until_complete)
+    try:
         yield logger
 
-        # If we get here, execution completed successfully
-        if logger.final_status == "success":
-            logger._finalize(success=True)
-        else:
-            # If not explicitly marked as success, assume it completed without explicit logging
-            logger._finalize(success=True)
+        # If not explicitly marked, assume it completed without explicit logging
+        logger._finalize(success=True)
 
     except Exception as e:
         # Execution failed
-        log_entry.status = "failure"
-        log_entry.error_message = str(e)
-        log_entry.completed_at = datetime.utcnow()
-        log_entry.execution_metadata = {
-            **(log_entry.execution_metadata or {}),
-            "execution_time_seconds": time.time() - start_time
-        }
-        session.commit()
+        row["status"] = "failure"
+        row["error_message"] = str(e)
+        logger._finalize(success=False)
         raise
-    finally:
-        session.close()
 
 
 class AgentLogger:
     """Logger object returned by log_agent_execution context manager."""
 
-    def __init__(self, log_entry: AgentExecutionLog, session: Any):
-        self.log_entry = log_entry
-        self.session = session
+    def __init__(self, row: Dict[str, Any], deferred: bool = True):
+        self.row = row
+        self.deferred = deferred
         self.final_status = None
         self._pending_metadata = {}  # Store metadata updates until finalization
+        self._started_monotonic = time.monotonic()  # For duration; immune to clock steps
 
     def log_success(self, metadata: Optional[Dict[str, Any]] = None):
         """Mark execution as successful with optional metadata."""
@@ -94,62 +222,58 @@ class AgentLogger:
     def log_failure(self, error_message: str, metadata: Optional[Dict[str, Any]] = None):
         """Mark execution as failed with error message and optional metadata."""
         self.final_status = "failure"
-        self.log_entry.status = "failure"
-        self.log_entry.error_message = error_message
+        self.row["status"] = "failure"
+        self.row["error_message"] = error_message
         # Store metadata to be applied during finalization
         self._pending_metadata.update(metadata or {})
 
     def log_partial(self, error_message: Optional[str] = None, metadata: Optional[Dict[str, Any]] = None):
         """Mark execution as partially successful with optional error and metadata."""
         self.final_status = "partial"
-        self.log_entry.status = "partial"
+        self.row["status"] = "partial"
         if error_message:
-            self.log_entry.error_message = error_message
+            self.row["error_message"] = error_message
         # Store metadata to be applied during finalization
         self._pending_metadata.update(metadata or {})
 
     def log_timeout(self, metadata: Optional[Dict[str, Any]] = None):
         """Mark execution as timed out."""
         self.final_status = "timeout"
-        self.log_entry.status = "timeout"
+        self.row["status"] = "timeout"
         # Store metadata to be applied during finalization
         self._pending_metadata.update(metadata or {})
 
     def _finalize(self, success: bool = True):
-        """Finalize the log entry."""
-        self.log_entry.completed_at = datetime.utcnow()
-        execution_time = (self.log_entry.completed_at - self.log_entry.started_at).total_seconds()
+        """Queue the completion update for the batched writer."""
+        self.row["completed_at"] = datetime.utcnow()
+        execution_time = time.monotonic() - self._started_monotonic
 
         if success and self.final_status:
-            self.log_entry.status = self.final_status
+            self.row["status"] = self.final_status
         elif success:
-            self.log_entry.status = "success"
+            self.row["status"] = "success"
 
-        # Apply any pending metadata updates
-        current_metadata = self.log_entry.execution_metadata or {}
-        self.log_entry.execution_metadata = {
-            **current_metadata,
-            **self._pending_metadata,
-            "execution_time_seconds": execution_time
-        }
+        # Apply any pending metadata updates in place; the row dict is private
+        # to this logger, so no copy is needed
+        metadata = self.row["execution_metadata"]
+        if metadata is None:
+            metadata = self.row["execution_metadata"] = {}
+        metadata.update(self._pending_metadata)
+        metadata["execution_time_seconds"] = execution_time
 
-        try:
-            # Try to commit with existing session
-            self.session.commit()
-        except Exception as e:
-            # If session is detached, create a new session and update
-            if "DetachedInstanceError" in str(e):
-                print(f"[LOGGER] Session detached, creating new session for finalization")
-                new_session = get_session_sync()
-                try:
-                    # Re-attach the log entry to the new session
-                    new_session.merge(self.log_entry)
-                    new_session.commit()
-                finally:
-                    new_session.close()
-            else:
-                # Re-raise other exceptions
-                raise
+        if self.deferred:
+            # No start row was written; emit the whole execution as one INSERT
+            _log_queue.put(("insert", dict(self.row)))
+        else:
+            # b_-prefixed keys: executemany params must not collide with the
+            # column names referenced in the UPDATE statement itself
+            _log_queue.put(("update", {
+                "b_id": self.row["id"],
+                "b_status": self.row["status"],
+                "b_error_message": self.row["error_message"],
+                "b_completed_at": self.row["completed_at"],
+                "b_execution_metadata": self.row["execution_metadata"],
+            }))
 
 
 def log_agent_success(
@@ -165,26 +289,22 @@ def log_agent_success(
     Returns the execution_id used for the log.
     """
     if not execution_id:
-        import uuid
-        execution_id = str(uuid.uuid4())[:8]
+        execution_id = secrets.token_hex(4)
 
-    session = get_session_sync()
-    try:
-        log_entry = AgentExecutionLog(
-            agent_name=agent_name,
-            business_id=business_id,
-            execution_id=execution_id,
-            input_snapshot=input_snapshot or {},
-            status="success",
-            execution_metadata=execution_metadata or {},
-            started_at=datetime.utcnow(),
-            completed_at=datetime.utcnow()
-        )
-        session.add(log_entry)
-        session.commit()
-        return execution_id
-    finally:
-        session.close()
+    now = datetime.utcnow()
+    _log_queue.put(("insert", {
+        "id": str(uuid.uuid4()),
+        "agent_name": agent_name,
+        "business_id": business_id,
+        "execution_id": execution_id,
+        "input_snapshot": input_snapshot or {},
+        "status": "success",
+        "error_message": None,
+        "execution_metadata": execution_metadata or {},
+        "started_at": now,
+        "completed_at": now,
+    }))
+    return execution_id
 
 
 def log_agent_failure(
@@ -201,24 +321,19 @@ def log_agent_failure(
     Returns the execution_id used for the log.
     """
     if not execution_id:
-        import uuid
-        execution_id = str(uuid.uuid4())[:8]
+        execution_id = secrets.token_hex(4)
 
-    session = get_session_sync()
-    try:
-        log_entry = AgentExecutionLog(
-            agent_name=agent_name,
-            business_id=business_id,
-            execution_id=execution_id,
-            input_snapshot=input_snapshot or {},
-            status="failure",
-            error_message=error_message,
-            execution_metadata=execution_metadata or {},
-            started_at=datetime.utcnow(),
-            completed_at=datetime.utcnow()
-        )
-        session.add(log_entry)
-        session.commit()
-        return execution_id
-    finally:
-        session.close()
+    now = datetime.utcnow()
+    _log_queue.put(("insert", {
+        "id": str(uuid.uuid4()),
+        "agent_name": agent_name,
+        "business_id": business_id,
+        "execution_id": execution_id,
+        "input_snapshot": input_snapshot or {},
+        "status": "failure",
+        "error_message": error_message,
+        "execution_metadata": execution_metadata or {},
+        "started_at": now,
+        "completed_at": now,
+    }))
+    return execution_id